@@ -0,0 +1,72 @@
+import mmap
+import shutil
+import zipfile
+from contextlib import contextmanager
+from fnmatch import fnmatch
+
+from constants import DOWNLOAD_CHUNK_SIZE
+
+ERROR_UNSAFE_MEMBER = 'Небезопасный путь в архиве {}: {}'
+CRC_FORMAT = '{:08x}'
+
+
+class MappedFile(mmap.mmap):
+    """Отображение файла в память, пригодное для чтения через zipfile."""
+
+    def seekable(self):
+        return True
+
+    def seek(self, *args):
+        # zipfile ожидает OSError при выходе за границы файла.
+        try:
+            return super().seek(*args)
+        except ValueError as e:
+            raise OSError(str(e)) from e
+
+
+@contextmanager
+def open_archive(archive_path):
+    with open(archive_path, 'rb') as file:
+        with MappedFile(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with zipfile.ZipFile(mapped) as archive:
+                yield archive
+
+
+def iter_members(archive, pattern=None):
+    for info in archive.infolist():
+        if info.is_dir():
+            continue
+        if pattern is None or fnmatch(info.filename, pattern):
+            yield info
+
+
+def get_manifest(archive_path, pattern=None):
+    with open_archive(archive_path) as archive:
+        return [
+            (
+                info.filename, info.file_size, info.compress_size,
+                CRC_FORMAT.format(info.CRC)
+            )
+            for info in iter_members(archive, pattern)
+        ]
+
+
+def get_member_path(target_dir, info):
+    target_dir = target_dir.resolve()
+    member_path = (target_dir / info.filename).resolve()
+    if target_dir not in member_path.parents:
+        raise ValueError(ERROR_UNSAFE_MEMBER.format(target_dir, info.filename))
+    return member_path
+
+
+def extract_matching(archive_path, pattern, target_dir):
+    extracted = []
+    with open_archive(archive_path) as archive:
+        for info in iter_members(archive, pattern):
+            member_path = get_member_path(target_dir, info)
+            member_path.parent.mkdir(parents=True, exist_ok=True)
+            with archive.open(info) as source:
+                with open(member_path, 'wb') as target:
+                    shutil.copyfileobj(source, target, DOWNLOAD_CHUNK_SIZE)
+            extracted.append(member_path)
+    return extracted
@@ -1,12 +1,21 @@
 import argparse
 import logging
 import sys
+import threading
+import time
 from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+import requests_cache
 
 from constants import (
-    LOG_FORMAT, DT_FORMAT,
-    LOG_DIR, LOG_FILE_PATH, OUTPUT_FORMAT_FILE, OUTPUT_FORMAT_PRETTY
+    ALL_DOWNLOAD_FORMATS, CONNECT_TIMEOUT, DOWNLOAD_FORMATS, DOWNLOAD_WORKERS,
+    LOG_FORMAT, DT_FORMAT, READ_TIMEOUT,
+    LOG_DIR, LOG_FILE_PATH, OUTPUT_FORMAT_FILE, OUTPUT_FORMAT_PRETTY,
+    PEP_BACKEND_HTML, PEP_BACKEND_JSON
 )
+from hedging import Hedger
+from warc import record_session, replay_session
 
 
 def configure_argument_parser(available_modes):
@@ -28,6 +37,125 @@ def configure_argument_parser(available_modes):
         choices=(OUTPUT_FORMAT_PRETTY, OUTPUT_FORMAT_FILE),
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '--page-size',
+        type=int,
+        metavar='N',
+        help='Выводить таблицу страницами по N строк с повтором заголовка'
+    )
+    parser.add_argument(
+        '-f',
+        '--formats',
+        nargs='+',
+        choices=(*DOWNLOAD_FORMATS, ALL_DOWNLOAD_FORMATS),
+        help='Форматы архивов документации для режима download'
+    )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help='Количество параллельных загрузок'
+    )
+    parser.add_argument(
+        '-e',
+        '--extract',
+        metavar='PATTERN',
+        help='Извлечь из архивов только файлы, подходящие под шаблон'
+    )
+    parser.add_argument(
+        '-q',
+        '--query',
+        help='Поисковый запрос для режима search (фраза — в кавычках)'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=(PEP_BACKEND_HTML, PEP_BACKEND_JSON),
+        default=PEP_BACKEND_HTML,
+        help=(
+            'Источник статусов для режима pep: страницы PEP или '
+            'JSON-индекс peps.python.org'
+        )
+    )
+    parser.add_argument(
+        '--sample',
+        type=int,
+        metavar='N',
+        help='Сверить статусы JSON-индекса со страницами N случайных PEP'
+    )
+    parser.add_argument(
+        '--status',
+        help='Фильтр режима query по статусу PEP'
+    )
+    parser.add_argument(
+        '--type',
+        help='Фильтр режима query по типу PEP'
+    )
+    parser.add_argument(
+        '--python-version',
+        help='Фильтр режима query по версии Python'
+    )
+    parser.add_argument(
+        '--record',
+        type=Path,
+        metavar='PATH',
+        help='Записывать все полученные ответы в WARC-архив'
+    )
+    parser.add_argument(
+        '--replay',
+        type=Path,
+        metavar='PATH',
+        help='Отвечать на все запросы из WARC-архива без обращения к сети'
+    )
+    parser.add_argument(
+        '--max-pages',
+        type=int,
+        metavar='N',
+        help=(
+            'Режим ограниченной памяти: одновременно загружается и '
+            'разбирается не более N страниц, включая потоки prefetch и '
+            'дублирующие запросы --hedge; деревья страниц освобождаются '
+            'сразу после разбора'
+        )
+    )
+    parser.add_argument(
+        '--trace-memory',
+        action='store_true',
+        help='Вывести пиковое потребление памяти и основные места выделения'
+    )
+    parser.add_argument(
+        '--diff',
+        type=int,
+        nargs=2,
+        metavar=('OLD', 'NEW'),
+        help='Сравнить два запуска из истории результатов'
+    )
+    parser.add_argument(
+        '--connect-timeout',
+        type=float,
+        default=CONNECT_TIMEOUT,
+        help='Таймаут установки соединения, секунды'
+    )
+    parser.add_argument(
+        '--read-timeout',
+        type=float,
+        default=READ_TIMEOUT,
+        help='Таймаут чтения ответа, секунды'
+    )
+    parser.add_argument(
+        '--deadline',
+        type=float,
+        metavar='SECONDS',
+        help=(
+            'Ограничение времени работы режима; по истечении возвращаются '
+            'неполные результаты'
+        )
+    )
+    parser.add_argument(
+        '--hedge',
+        action='store_true',
+        help='Дублировать запросы, выполняющиеся дольше p95 прошлых'
+    )
     return parser
 
 
@@ -48,3 +176,29 @@ def configure_logging():
             rotating_handler
         ]
     )
+
+
+def configure_session(cli_args):
+    replay_path = getattr(cli_args, 'replay', None)
+    if replay_path is None:
+        session = requests_cache.CachedSession()
+    else:
+        session = replay_session(
+            requests_cache.CachedSession(backend='memory'), replay_path
+        )
+    record_path = getattr(cli_args, 'record', None)
+    if record_path is not None:
+        record_session(session, record_path)
+    session.timeout = (
+        getattr(cli_args, 'connect_timeout', CONNECT_TIMEOUT),
+        getattr(cli_args, 'read_timeout', READ_TIMEOUT),
+    )
+    deadline = getattr(cli_args, 'deadline', None)
+    if deadline is not None:
+        session.deadline = time.monotonic() + deadline
+    if getattr(cli_args, 'hedge', False):
+        session.hedger = Hedger()
+    max_pages = getattr(cli_args, 'max_pages', None)
+    if max_pages:
+        session.page_slots = threading.BoundedSemaphore(max_pages)
+    return session
@@ -18,13 +18,50 @@ def get_downloads_dir(base_dir=None):
     return base_dir / DOWNLOADS_DIR_NAME
 
 
+DOWNLOAD_FORMATS = {
+    'pdf-letter': 'pdf-letter.zip',
+    'pdf-a4': 'pdf-a4.zip',
+    'html': 'html.zip',
+    'text': 'text.zip',
+    'epub': 'docs.epub',
+}
+DEFAULT_DOWNLOAD_FORMAT = 'pdf-a4'
+ALL_DOWNLOAD_FORMATS = 'all'
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+SEGMENT_SIZE = 8 * 1024 * 1024
+SEGMENT_THRESHOLD = 2 * SEGMENT_SIZE
+
+INDEX_DIR_NAME = 'index'
+SEARCH_INDEX_FILE_NAME = 'search.sqlite3'
+PEP_STORE_FILE_NAME = 'peps.sqlite3'
+HISTORY_FILE_NAME = 'history.sqlite3'
+
+
 OUTPUT_FORMAT_PRETTY = 'pretty'
 OUTPUT_FORMAT_FILE = 'file'
+TABLE_SAMPLE_SIZE = 1000
 LOG_FORMAT = '%(asctime)s - [%(levelname)s] - %(message)s'
 DT_FORMAT = '%d.%m.%Y %H:%M:%S'
 
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+HEDGE_WINDOW = 200
+HEDGE_WORKERS = 8
+
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 PEP_INDEX_URL = 'https://peps.python.org/'
+PEP_JSON_PATH = 'api/peps.json'
+PEP_BACKEND_HTML = 'html'
+PEP_BACKEND_JSON = 'json'
+JSON_CHUNK_SIZE = 64 * 1024
+
+VERSION_STATUSES = (
+    'in development', 'stable', 'security-fixes', 'pre-release'
+)
+DEFAULT_VERSION_STATUS = 'EOL'
 
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
@@ -0,0 +1,120 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from requests import RequestException
+
+from constants import (
+    DOWNLOAD_CHUNK_SIZE, DOWNLOAD_WORKERS, SEGMENT_SIZE, SEGMENT_THRESHOLD
+)
+from utils import get_response, get_timeout
+
+ERROR_HEAD_FAILED = 'Не удалось получить заголовки файла {}: {}'
+ERROR_SEGMENT_FAILED = 'Сервер не вернул диапазон {}-{} файла {}'
+ERROR_SEGMENT_RANGE = 'Сервер вернул диапазон {} вместо {}-{} файла {}'
+ERROR_SEGMENT_SHORT = 'Получено {} байт вместо {} в диапазоне {}-{} файла {}'
+CONTENT_RANGE_PATTERN = re.compile(r'bytes (\d+)-(\d+)/')
+PARTIAL_SUFFIX = '.part'
+PARTIAL_CONTENT = 206
+RANGE_HEADER = 'bytes={}-{}'
+NO_STORE_HEADERS = {'Cache-Control': 'no-store'}
+
+
+def get_file_size(session, url, slots):
+    try:
+        with slots:
+            response = session.head(
+                url, allow_redirects=True,
+                timeout=get_timeout(session, url)
+            )
+    except RequestException as e:
+        raise ConnectionError(ERROR_HEAD_FAILED.format(url, e)) from e
+    if response.headers.get('Accept-Ranges') != 'bytes':
+        return None
+    return int(response.headers.get('Content-Length', 0)) or None
+
+
+def split_segments(size, segment_size):
+    return [
+        (start, min(start + segment_size, size) - 1)
+        for start in range(0, size, segment_size)
+    ]
+
+
+def check_content_range(response, url, start, end):
+    content_range = response.headers.get('Content-Range', '')
+    match = CONTENT_RANGE_PATTERN.match(content_range)
+    if match is None or tuple(map(int, match.groups())) != (start, end):
+        raise ConnectionError(
+            ERROR_SEGMENT_RANGE.format(content_range, start, end, url)
+        )
+
+
+def download_segment(session, url, path, segment, slots):
+    start, end = segment
+    headers = {'Range': RANGE_HEADER.format(start, end), **NO_STORE_HEADERS}
+    with slots:
+        response = get_response(session, url, headers=headers, stream=True)
+        if response.status_code != PARTIAL_CONTENT:
+            raise ConnectionError(ERROR_SEGMENT_FAILED.format(start, end, url))
+        check_content_range(response, url, start, end)
+        written = 0
+        with open(path, 'r+b') as file:
+            file.seek(start)
+            for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                written += file.write(chunk)
+    if written != end - start + 1:
+        raise ConnectionError(ERROR_SEGMENT_SHORT.format(
+            written, end - start + 1, start, end, url
+        ))
+
+
+def download_segmented(session, url, path, size, slots, workers):
+    partial_path = path.with_name(path.name + PARTIAL_SUFFIX)
+    with open(partial_path, 'wb') as file:
+        file.truncate(size)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(
+                lambda segment: download_segment(
+                    session, url, partial_path, segment, slots
+                ),
+                split_segments(size, SEGMENT_SIZE)
+            ))
+    except BaseException:
+        partial_path.unlink()
+        raise
+    partial_path.replace(path)
+
+
+def download_file(
+    session, url, downloads_dir, workers=DOWNLOAD_WORKERS, slots=None
+):
+    if slots is None:
+        slots = threading.BoundedSemaphore(workers)
+    path = downloads_dir / url.split('/')[-1]
+    # В WARC-архив попадают только полные GET-ответы без диапазонов.
+    size = (
+        get_file_size(session, url, slots)
+        if getattr(session, 'warc_path', None) is None else None
+    )
+    if size is not None and size >= SEGMENT_THRESHOLD:
+        download_segmented(session, url, path, size, slots, workers)
+        return path
+    with slots:
+        response = get_response(session, url)
+    with open(path, 'wb') as file:
+        file.write(response.content)
+    return path
+
+
+def download_files(session, urls, downloads_dir, workers=DOWNLOAD_WORKERS):
+    # Общий семафор ограничивает число соединений для всех файлов сразу.
+    slots = threading.BoundedSemaphore(workers)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            lambda url: download_file(
+                session, url, downloads_dir, workers, slots
+            ),
+            urls
+        ))
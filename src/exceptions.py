@@ -1,2 +1,6 @@
 class ParserFindTagException(Exception):
     """Вызывается, когда парсер не может найти тег."""
+
+
+class DeadlineExceededException(Exception):
+    """Вызывается, когда истекло время, отведённое на работу парсера."""
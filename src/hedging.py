@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+
+from constants import (
+    HEDGE_MIN_SAMPLES, HEDGE_PERCENTILE, HEDGE_WINDOW, HEDGE_WORKERS
+)
+
+
+class Hedger:
+    """Дублирует запрос, если он выполняется дольше p95 прошлых запросов."""
+
+    def __init__(
+        self, percentile=HEDGE_PERCENTILE, min_samples=HEDGE_MIN_SAMPLES,
+        window=HEDGE_WINDOW, workers=HEDGE_WORKERS
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.latencies = deque(maxlen=window)
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def get_delay(self):
+        with self.lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            latencies = sorted(self.latencies)
+        return latencies[int(self.percentile * (len(latencies) - 1))]
+
+    def submit_duplicate(self, session, submit, pending):
+        # Дубликат занимает отдельное место среди страниц --max-pages.
+        page_slots = getattr(session, 'page_slots', None)
+        if page_slots is None:
+            pending.add(submit())
+            return
+        if not page_slots.acquire(blocking=False):
+            return
+        duplicate = submit()
+        duplicate.add_done_callback(lambda future: page_slots.release())
+        pending.add(duplicate)
+
+    def timed_get(self, session, url, **kwargs):
+        started = time.monotonic()
+        response = session.get(url, **kwargs)
+        if getattr(response, 'from_cache', False):
+            return response
+        with self.lock:
+            self.latencies.append(time.monotonic() - started)
+        return response
+
+    def get(self, session, url, **kwargs):
+        delay = self.get_delay()
+        submit = partial(
+            self.executor.submit, self.timed_get, session, url, **kwargs
+        )
+        pending = {submit()}
+        done, _ = wait(pending, timeout=delay)
+        if not done:
+            self.submit_duplicate(session, submit, pending)
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            failed = [future for future in done if future.exception()]
+            succeeded = [future for future in done if not future.exception()]
+            if succeeded:
+                for future in pending:
+                    future.cancel()
+                return succeeded[0].result()
+            if not pending:
+                return failed[0].result()
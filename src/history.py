@@ -0,0 +1,147 @@
+import hashlib
+import json
+import sqlite3
+from collections import Counter
+
+CHUNK_BOUNDARY = 16
+MAX_CHUNK_ROWS = 64
+ROW_ADDED = '+'
+ROW_REMOVED = '-'
+ERROR_RUN_NOT_FOUND = 'Запуск {} не найден в истории результатов'
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS rows (
+    hash TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chunks (
+    hash TEXT PRIMARY KEY,
+    rows TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    created TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    chunks TEXT NOT NULL,
+    row_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_mode_created ON runs (mode, created);
+'''
+
+
+def get_hash(data):
+    return hashlib.blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def split_chunks(row_hashes):
+    chunk = []
+    for row_hash in row_hashes:
+        chunk.append(row_hash)
+        if (
+            int(row_hash, 16) % CHUNK_BOUNDARY == 0
+            or len(chunk) >= MAX_CHUNK_ROWS
+        ):
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def connect_history(history_path):
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(history_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def get_latest_digest(connection, mode):
+    row = connection.execute(
+        'SELECT digest FROM runs WHERE mode = ? '
+        'ORDER BY created DESC, id DESC LIMIT 1',
+        (mode,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def save_run(connection, mode, created, results):
+    row_data = [json.dumps(list(row), ensure_ascii=False) for row in results]
+    row_hashes = [get_hash(data) for data in row_data]
+    chunks = [json.dumps(chunk) for chunk in split_chunks(row_hashes)]
+    chunk_hashes = [get_hash(chunk) for chunk in chunks]
+    digest = get_hash(''.join(chunk_hashes))
+    unchanged = digest == get_latest_digest(connection, mode)
+    with connection:
+        connection.executemany(
+            'INSERT OR IGNORE INTO rows (hash, data) VALUES (?, ?)',
+            zip(row_hashes, row_data)
+        )
+        connection.executemany(
+            'INSERT OR IGNORE INTO chunks (hash, rows) VALUES (?, ?)',
+            zip(chunk_hashes, chunks)
+        )
+        cursor = connection.execute(
+            'INSERT INTO runs (mode, created, digest, chunks, row_count) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (mode, created, digest, json.dumps(chunk_hashes), len(results))
+        )
+    return cursor.lastrowid, unchanged
+
+
+def list_runs(connection, mode=None):
+    return connection.execute(
+        'SELECT id, mode, created, row_count, digest FROM runs '
+        'WHERE ? IS NULL OR mode = ? ORDER BY mode, created, id',
+        (mode, mode)
+    ).fetchall()
+
+
+def get_run_chunks(connection, run_id):
+    row = connection.execute(
+        'SELECT chunks FROM runs WHERE id = ?', (run_id,)
+    ).fetchone()
+    if row is None:
+        raise ValueError(ERROR_RUN_NOT_FOUND.format(run_id))
+    return json.loads(row[0])
+
+
+def get_chunk_rows(connection, chunk_hashes):
+    rows = Counter()
+    for chunk_hash, count in chunk_hashes.items():
+        (data,) = connection.execute(
+            'SELECT rows FROM chunks WHERE hash = ?', (chunk_hash,)
+        ).fetchone()
+        for row_hash in json.loads(data):
+            rows[row_hash] += count
+    return rows
+
+
+def load_rows(connection, row_hashes):
+    return [
+        tuple(json.loads(connection.execute(
+            'SELECT data FROM rows WHERE hash = ?', (row_hash,)
+        ).fetchone()[0]))
+        for row_hash in row_hashes
+    ]
+
+
+def get_run_header(connection, run_id):
+    first_chunk, *_ = get_run_chunks(connection, run_id)
+    first_row, *_ = get_chunk_rows(connection, Counter([first_chunk]))
+    return load_rows(connection, [first_row])[0]
+
+
+def diff_runs(connection, old_run_id, new_run_id):
+    old_chunks = Counter(get_run_chunks(connection, old_run_id))
+    new_chunks = Counter(get_run_chunks(connection, new_run_id))
+    old_rows = get_chunk_rows(connection, old_chunks - new_chunks)
+    new_rows = get_chunk_rows(connection, new_chunks - old_chunks)
+    return [
+        *(
+            (ROW_REMOVED, *row)
+            for row in load_rows(connection, (old_rows - new_rows).elements())
+        ),
+        *(
+            (ROW_ADDED, *row)
+            for row in load_rows(connection, (new_rows - old_rows).elements())
+        ),
+    ]
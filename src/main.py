@@ -1,19 +1,49 @@
 import logging
-from collections import defaultdict
+import random
+import tracemalloc
+import zipfile
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from functools import partial
 from urllib.parse import urljoin
 
-import requests_cache
 from tqdm import tqdm
 
-from configs import configure_argument_parser, configure_logging
+from archives import extract_matching, get_manifest
+from configs import (
+    configure_argument_parser, configure_logging, configure_session
+)
 from constants import (
-    BASE_DIR, MAIN_DOC_URL, PEP_INDEX_URL, get_downloads_dir
+    ALL_DOWNLOAD_FORMATS, BASE_DIR, DEFAULT_DOWNLOAD_FORMAT,
+    DEFAULT_VERSION_STATUS, DOWNLOAD_FORMATS, DOWNLOAD_WORKERS,
+    EXPECTED_STATUS, HISTORY_FILE_NAME, INDEX_DIR_NAME, JSON_CHUNK_SIZE,
+    MAIN_DOC_URL, PEP_BACKEND_HTML, PEP_BACKEND_JSON, PEP_INDEX_URL,
+    PEP_JSON_PATH, PEP_STORE_FILE_NAME, RESULTS_DIR_NAME,
+    SEARCH_INDEX_FILE_NAME, VERSION_STATUSES, get_downloads_dir
 )
+from downloads import download_files
+from exceptions import DeadlineExceededException, ParserFindTagException
+from history import connect_history, diff_runs, get_run_header, list_runs
 from outputs import control_output
-from utils import find_tag, get_response, get_soup
+from peps import (
+    JsonObjectStream, connect_pep_store, parse_pep_index, parse_pep_json,
+    parse_pep_page, query_pep_records, save_pep_records
+)
+from search import connect_index, search_index, update_index
+from specs import (
+    DOWNLOAD_ARCHIVES, LATEST_VERSIONS, WHATS_NEW_INDEX, WHATS_NEW_PAGE
+)
+from utils import get_response, get_soup, page_slot, page_soup
 
 ARCHIVE_SAVED_MESSAGE = 'Архив был загружен и сохранён: {archive_path}'
 FILE_SAVED_MESSAGE = 'Файл сохранён по пути: {archive_path}'
+NOT_ARCHIVE_MESSAGE = 'Файл {archive_path} не является zip-архивом, пропущен'
+FILES_EXTRACTED_MESSAGE = 'Извлечено файлов из {archive_path}: {count}'
+INDEX_UPDATED_MESSAGE = (
+    'Индекс обновлён для {archive_path}: '
+    'проиндексировано {updated}, удалено {removed}'
+)
 PARSING_STARTED_MESSAGE = 'Парсер запущен!'
 ARGS_MESSAGE = 'Аргументы командной строки: {args}'
 CACHE_CLEARED_MESSAGE = 'Кеш очищен.'
@@ -29,148 +59,445 @@ INCONSISTENCY_MESSAGE = (
     'Статус в карточке: {status}\n'
     'Ожидаемый статус: {expected_status}'
 )
+UNKNOWN_STATUS_MESSAGE = 'Неизвестный статус {status} у PEP {pep_link}'
 FAILED_PEPS_MESSAGE = 'Не удалось получить следующие страницы PEP:'
+MEMORY_PEAK_MESSAGE = (
+    'Пиковое потребление памяти в режиме {mode}: {peak:.1f} МиБ'
+)
+MEMORY_SITE_MESSAGE = '{site}: {size:.1f} КиБ в {count} блоках'
+TRACEMALLOC_FRAMES = 1
+TRACEMALLOC_TOP = 10
+PREFETCH_FETCHED = 'Загружено'
+PREFETCH_CACHED = 'Уже в кеше'
+PREFETCH_FAILED = 'Ошибка загрузки'
+PREFETCH_SKIPPED = 'Пропущено: истекло время работы'
+PARTIAL_RESULTS_MARK = 'Результаты неполные'
+PARTIAL_RESULTS_MESSAGE = (
+    'Истекло время работы парсера, возвращены неполные результаты.'
+)
 
 
-def whats_new(session):
+def whats_new(session, cli_args=None):
     whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
-    soup = get_soup(session, whats_new_url)
-    main_section = find_tag(
-        soup, 'section', attrs={'id': 'what-s-new-in-python'}
-    )
-    sections = main_section.find_all('div', class_='toctree-wrapper compound')
     results = [('Ссылка на статью', 'Заголовок', 'Редактор, автор')]
     errors = []
-    for section in tqdm(sections):
-        h2_tag = section.find('h2')
-        if h2_tag is None:
-            errors.append(ERROR_H2_NOT_FOUND.format(section))
-            continue
-        version_text = h2_tag.text.strip()
-        link_tag = section.find('a')
-        link = urljoin(whats_new_url, link_tag['href'])
+    completed = True
+    try:
+        links = get_whats_new_links(session, whats_new_url, errors)
+    except DeadlineExceededException:
+        return mark_partial(results, False)
+    for link, version_text in tqdm(links):
         try:
-            new_page_soup = get_soup(session, link)
+            with page_soup(session, link) as new_page_soup:
+                author_text = WHATS_NEW_PAGE.extract(new_page_soup)['author']
         except ConnectionError as e:
             errors.append(ERROR_PAGE_LOAD_FAILED.format(link, e))
             continue
-
-        author_tag = new_page_soup.find('p', class_='author')
-        author_text = (
-            author_tag.text.strip()
-            if author_tag else DEFAULT_AUTHOR
-        )
-        results.append((link, version_text, author_text))
+        except DeadlineExceededException:
+            completed = False
+            break
+        results.append((link, version_text, author_text or DEFAULT_AUTHOR))
     if errors:
         logging.warning('\n'.join(errors))
 
-    return results
+    return mark_partial(results, completed)
+
 
+def mark_partial(results, completed):
+    if completed:
+        return results
+    logging.warning(PARTIAL_RESULTS_MESSAGE)
+    return [
+        *results,
+        (PARTIAL_RESULTS_MARK, *[''] * (len(results[0]) - 1)),
+    ]
+
+
+def get_whats_new_links(session, whats_new_url, errors):
+    links = []
+    with page_soup(session, whats_new_url) as soup:
+        for section in WHATS_NEW_INDEX.extract(soup):
+            link = urljoin(whats_new_url, section['href'])
+            if section['version'] is None:
+                errors.append(ERROR_H2_NOT_FOUND.format(link))
+                continue
+            links.append((link, section['version']))
+    return links
 
-def latest_versions(session):
-    soup = get_soup(session, MAIN_DOC_URL, parser='html.parser')
-    sidebar = find_tag(soup, 'div', {'class': 'sphinxsidebarwrapper'})
-    ul_tags = sidebar.find_all('ul')
+
+def latest_versions(session, cli_args=None):
     results = [('Ссылка на документацию', 'Версия', 'Статус')]
-    for ul in ul_tags:
-        if 'All versions' in ul.text:
-            a_tags = ul.find_all('a')
-            for a_tag in a_tags:
-                href = urljoin(MAIN_DOC_URL, a_tag['href'])
-                version_text = a_tag.text
-                status = 'EOL'
-                if 'in development' in version_text.lower():
-                    status = 'in development'
-                elif 'stable' in version_text.lower():
-                    status = 'stable'
-                elif 'security-fixes' in version_text.lower():
-                    status = 'security-fixes'
-                elif 'pre-release' in version_text.lower():
-                    status = 'pre-release'
-                results.append((href, version_text, status))
+    try:
+        with page_soup(session, MAIN_DOC_URL, parser='html.parser') as soup:
+            versions = LATEST_VERSIONS.extract(soup)
+    except DeadlineExceededException:
+        return mark_partial(results, False)
+    for version in versions:
+        version_text = version['version']
+        results.append((
+            urljoin(MAIN_DOC_URL, version['href']),
+            version_text,
+            get_version_status(version_text)
+        ))
     return results
 
 
-def download(session):
+def get_version_status(version_text):
+    for status in VERSION_STATUSES:
+        if status in version_text.lower():
+            return status
+    return DEFAULT_VERSION_STATUS
+
+
+def download(session, cli_args=None):
+    try:
+        archive_paths = download_archives(session, cli_args)
+    except DeadlineExceededException:
+        logging.warning(PARTIAL_RESULTS_MESSAGE)
+        return
+    for archive_path in archive_paths:
+        logging.info(ARCHIVE_SAVED_MESSAGE.format(archive_path=archive_path))
+        extract_archive(archive_path, getattr(cli_args, 'extract', None))
+
+
+def download_archives(session, cli_args):
     downloads_url = urljoin(MAIN_DOC_URL, 'download.html')
     soup = get_soup(session, downloads_url)
-    pdf_a4_tag = soup.select_one(
-        'div[role="main"] table.docutils a[href$="pdf-a4.zip"]'
-    )
-    archive_url = urljoin(MAIN_DOC_URL, pdf_a4_tag['href'])
-    filename = archive_url.split('/')[-1]
+    archive_urls = [
+        urljoin(MAIN_DOC_URL, find_archive_tag(soup, archive_format)['href'])
+        for archive_format in get_download_formats(cli_args)
+    ]
     DOWNLOADS_DIR = get_downloads_dir(base_dir=BASE_DIR)
     DOWNLOADS_DIR.mkdir(exist_ok=True)
-    archive_path = DOWNLOADS_DIR / filename
-    response = get_response(session, archive_url)
-    with open(archive_path, 'wb') as file:
-        file.write(response.content)
-    logging.info(ARCHIVE_SAVED_MESSAGE.format(archive_path=archive_path))
+    return download_files(
+        session, archive_urls, DOWNLOADS_DIR,
+        workers=getattr(cli_args, 'workers', None) or DOWNLOAD_WORKERS
+    )
+
+
+def get_download_formats(cli_args):
+    formats = getattr(cli_args, 'formats', None) or [DEFAULT_DOWNLOAD_FORMAT]
+    if ALL_DOWNLOAD_FORMATS in formats:
+        return list(DOWNLOAD_FORMATS)
+    return list(dict.fromkeys(formats))
+
+
+def find_archive_tag(soup, archive_format):
+    return DOWNLOAD_ARCHIVES[archive_format].find(soup)
+
+
+def extract_archive(archive_path, pattern):
+    if pattern is None or not zipfile.is_zipfile(archive_path):
+        return
+    extracted = extract_matching(
+        archive_path, pattern, archive_path.with_suffix('')
+    )
+    logging.info(FILES_EXTRACTED_MESSAGE.format(
+        count=len(extracted), archive_path=archive_path
+    ))
+
+
+def iter_archives(downloads_dir):
+    for archive_path in sorted(downloads_dir.glob('*.zip')):
+        if not zipfile.is_zipfile(archive_path):
+            logging.warning(
+                NOT_ARCHIVE_MESSAGE.format(archive_path=archive_path)
+            )
+            continue
+        yield archive_path
+
+
+def archive(session, cli_args=None):
+    pattern = getattr(cli_args, 'extract', None)
+    DOWNLOADS_DIR = get_downloads_dir(base_dir=BASE_DIR)
+    results = [
+        ('Архив', 'Файл', 'Размер', 'Сжатый размер', 'CRC32')
+    ]
+    for archive_path in iter_archives(DOWNLOADS_DIR):
+        results.extend(
+            (archive_path.name, *member)
+            for member in get_manifest(archive_path, pattern)
+        )
+        extract_archive(archive_path, pattern)
+    return results
+
+
+def search(session, cli_args=None):
+    DOWNLOADS_DIR = get_downloads_dir(base_dir=BASE_DIR)
+    connection = connect_index(
+        BASE_DIR / INDEX_DIR_NAME / SEARCH_INDEX_FILE_NAME
+    )
+    with closing(connection):
+        for archive_path in iter_archives(DOWNLOADS_DIR):
+            updated, removed = update_index(connection, archive_path)
+            logging.info(INDEX_UPDATED_MESSAGE.format(
+                archive_path=archive_path, updated=updated, removed=removed
+            ))
+        query = getattr(cli_args, 'query', None)
+        if query is None:
+            return None
+        return [
+            ('Документ', 'Совпадений'),
+            *search_index(connection, query),
+        ]
+
+
+def pep(session, cli_args=None):
+    backend = getattr(cli_args, 'backend', None) or PEP_BACKEND_HTML
+    return PEP_BACKENDS[backend](session, cli_args)
 
 
-def pep(session):
-    soup = get_soup(session, PEP_INDEX_URL)
-    pep_links = soup.select('#pep-content td a[href^=\'/dev/peps/pep-\']')
+def pep_html(session, cli_args=None):
     results = defaultdict(int)
     inconsistencies = []
     failed_peps = []
+    records = []
 
-    for link in tqdm(pep_links):
-        pep_link = urljoin(PEP_INDEX_URL, link['href'])
-        process_pep_link(
-            session, pep_link, link, results,
-            inconsistencies, failed_peps
+    completed = True
+    try:
+        with page_soup(session, PEP_INDEX_URL) as soup:
+            pep_entries = parse_pep_index(soup, PEP_INDEX_URL)
+    except DeadlineExceededException:
+        pep_entries = {}
+        completed = False
+
+    for pep_link, expected_statuses in tqdm(pep_entries.values()):
+        try:
+            process_pep_link(
+                session, pep_link, expected_statuses, results,
+                inconsistencies, failed_peps, records
+            )
+        except DeadlineExceededException:
+            completed = False
+            break
+
+    return report_peps(
+        results, inconsistencies, failed_peps, records, completed
+    )
+
+
+def pep_json(session, cli_args=None):
+    known_statuses = set().union(*EXPECTED_STATUS.values())
+    results = defaultdict(int)
+    inconsistencies = []
+    records = {}
+    try:
+        read_pep_json(
+            session, known_statuses, results, inconsistencies, records
+        )
+    except DeadlineExceededException:
+        return report_peps(
+            results, inconsistencies, [], records.values(), False
         )
 
+    failed_peps = []
+    completed = check_pep_sample(
+        session, records, getattr(cli_args, 'sample', None),
+        inconsistencies, failed_peps
+    )
+    return report_peps(
+        results, inconsistencies, failed_peps, records.values(), completed
+    )
+
+
+def read_pep_json(session, known_statuses, results, inconsistencies, records):
+    response = get_response(
+        session, urljoin(PEP_INDEX_URL, PEP_JSON_PATH), stream=True
+    )
+    with closing(response):
+        for key, entry in JsonObjectStream(
+            response.iter_content(JSON_CHUNK_SIZE, decode_unicode=True)
+        ):
+            record = parse_pep_json(key, entry)
+            pep_link = entry.get('url') or urljoin(
+                PEP_INDEX_URL, f'pep-{record.number:04d}/'
+            )
+            results[record.status] += 1
+            records[pep_link] = record
+            if record.status not in known_statuses:
+                inconsistencies.append(UNKNOWN_STATUS_MESSAGE.format(
+                    status=record.status, pep_link=pep_link
+                ))
+
+
+def check_pep_sample(session, records, sample, inconsistencies, failed_peps):
+    if not sample:
+        return True
+    sampled = random.sample(list(records), min(sample, len(records)))
+    for pep_link in tqdm(sampled):
+        try:
+            process_pep_link(
+                session, pep_link, {records[pep_link].status},
+                defaultdict(int), inconsistencies, failed_peps, []
+            )
+        except DeadlineExceededException:
+            return False
+    return True
+
+
+def report_peps(results, inconsistencies, failed_peps, records, completed):
     list(map(logging.warning, inconsistencies))
     if failed_peps:
         logging.warning(FAILED_PEPS_MESSAGE)
         list(map(logging.warning, failed_peps))
+    with closing(connect_pep_store(get_pep_store_path())) as connection:
+        save_pep_records(connection, records)
 
-    return [
+    return mark_partial([
         ('Статус', 'Количество'),
         *results.items(),
         ('Total', sum(results.values())),
-    ]
+    ], completed)
 
 
 def process_pep_link(
-    session, pep_link, link, results,
-    inconsistencies, failed_peps
+    session, pep_link, expected_statuses, results,
+    inconsistencies, failed_peps, records
 ):
     try:
-        pep_soup = get_soup(session, pep_link)
+        with page_soup(session, pep_link) as pep_soup:
+            record = parse_pep_page(pep_soup, pep_link)
     except ConnectionError as e:
         failed_peps.append(ERROR_PEP_LOAD_FAILED.format(pep_link, e))
         return
-
-    status_tag = find_tag(pep_soup, 'dt', string='Status')
-    if status_tag is None:
+    except ParserFindTagException:
+        record = None
+    if record is None or record.status is None:
         failed_peps.append(ERROR_STATUS_NOT_FOUND.format(pep_link))
         return
 
-    status = status_tag.find_next_sibling('dd').text.strip()
+    status = record.status
     results[status] += 1
+    records.append(record)
 
-    expected_status = link.parent.find_next_sibling('td').text.strip()
-    if expected_status and expected_status != status:
+    if expected_statuses and status not in expected_statuses:
         inconsistencies.append(
             INCONSISTENCY_MESSAGE.format(
                 pep_link=pep_link,
                 status=status,
-                expected_status=expected_status
+                expected_status=', '.join(sorted(expected_statuses))
             )
         )
 
 
+def prefetch(session, cli_args=None):
+    try:
+        urls = discover_urls(session)
+    except DeadlineExceededException:
+        return mark_partial([('Результат', 'Количество'), ('Total', 0)], False)
+    workers = getattr(cli_args, 'workers', None) or DOWNLOAD_WORKERS
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = Counter(tqdm(
+            executor.map(partial(prefetch_url, session), urls),
+            total=len(urls)
+        ))
+    return mark_partial([
+        ('Результат', 'Количество'),
+        *outcomes.items(),
+        ('Total', len(urls)),
+    ], PREFETCH_SKIPPED not in outcomes)
+
+
+def discover_urls(session):
+    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
+    errors = []
+    whats_new_links = get_whats_new_links(session, whats_new_url, errors)
+    list(map(logging.warning, errors))
+    with page_soup(session, PEP_INDEX_URL) as soup:
+        pep_entries = parse_pep_index(soup, PEP_INDEX_URL)
+    return list(dict.fromkeys((
+        MAIN_DOC_URL,
+        urljoin(MAIN_DOC_URL, 'download.html'),
+        urljoin(PEP_INDEX_URL, PEP_JSON_PATH),
+        *(link for link, _ in whats_new_links),
+        *(pep_link for pep_link, _ in pep_entries.values()),
+    )))
+
+
+def prefetch_url(session, url):
+    try:
+        with page_slot(session):
+            response = get_response(session, url)
+    except ConnectionError as e:
+        logging.warning(ERROR_PAGE_LOAD_FAILED.format(url, e))
+        return PREFETCH_FAILED
+    except DeadlineExceededException:
+        return PREFETCH_SKIPPED
+    if getattr(response, 'from_cache', False):
+        return PREFETCH_CACHED
+    return PREFETCH_FETCHED
+
+
+def history(session, cli_args=None):
+    history_path = BASE_DIR / RESULTS_DIR_NAME / HISTORY_FILE_NAME
+    with closing(connect_history(history_path)) as connection:
+        run_ids = getattr(cli_args, 'diff', None)
+        if run_ids is None:
+            return [
+                ('Запуск', 'Режим', 'Время', 'Строк', 'Дайджест'),
+                *list_runs(connection),
+            ]
+        return [
+            ('Изменение', *get_run_header(connection, run_ids[1])),
+            *diff_runs(connection, *run_ids),
+        ]
+
+
+def get_pep_store_path():
+    return BASE_DIR / INDEX_DIR_NAME / PEP_STORE_FILE_NAME
+
+
+def query(session, cli_args=None):
+    with closing(connect_pep_store(get_pep_store_path())) as connection:
+        records = query_pep_records(
+            connection,
+            status=getattr(cli_args, 'status', None),
+            type=getattr(cli_args, 'type', None),
+            python_version=getattr(cli_args, 'python_version', None),
+        )
+    return [
+        ('PEP', 'Название', 'Статус', 'Тип', 'Версия Python', 'Автор'),
+        *(
+            (
+                record.number, record.title, record.status, record.type,
+                record.python_version, record.author
+            )
+            for record in records
+        ),
+    ]
+
+
+PEP_BACKENDS = {
+    PEP_BACKEND_HTML: pep_html,
+    PEP_BACKEND_JSON: pep_json,
+}
 MODE_TO_FUNCTION = {
     'whats-new': whats_new,
     'latest-versions': latest_versions,
     'download': download,
     'pep': pep,
+    'archive': archive,
+    'search': search,
+    'query': query,
+    'prefetch': prefetch,
+    'history': history,
 }
 
 
+def report_memory_usage(mode):
+    _, peak = tracemalloc.get_traced_memory()
+    statistics = tracemalloc.take_snapshot().statistics('lineno')
+    tracemalloc.stop()
+    logging.info(MEMORY_PEAK_MESSAGE.format(
+        mode=mode, peak=peak / 1024 ** 2
+    ))
+    for statistic in statistics[:TRACEMALLOC_TOP]:
+        logging.info(MEMORY_SITE_MESSAGE.format(
+            site=statistic.traceback, size=statistic.size / 1024,
+            count=statistic.count
+        ))
+
+
 def main():
     configure_logging()
     logging.info(PARSING_STARTED_MESSAGE)
@@ -179,13 +506,17 @@ def main():
         args = arg_parser.parse_args()
         logging.info(ARGS_MESSAGE.format(args=args))
 
-        session = requests_cache.CachedSession()
+        session = configure_session(args)
         if args.clear_cache:
             session.cache.clear()
             logging.info(CACHE_CLEARED_MESSAGE)
 
         parser_mode = args.mode
-        results = MODE_TO_FUNCTION[parser_mode](session)
+        if args.trace_memory:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        results = MODE_TO_FUNCTION[parser_mode](session, args)
+        if args.trace_memory:
+            report_memory_usage(parser_mode)
 
         if results:
             control_output(results, args)
@@ -1,13 +1,27 @@
 import csv
 import datetime as dt
 import logging
-
-from prettytable import PrettyTable
+import sys
+import unicodedata
+from collections.abc import Sequence
+from contextlib import closing
+from functools import lru_cache
+from itertools import chain, islice
 
 from constants import (
-    BASE_DIR, DATETIME_FORMAT, RESULTS_DIR_NAME,
-    SAVE_MESSAGE, OUTPUT_FORMAT_FILE, OUTPUT_FORMAT_PRETTY
+    BASE_DIR, DATETIME_FORMAT, HISTORY_FILE_NAME, RESULTS_DIR_NAME,
+    SAVE_MESSAGE, OUTPUT_FORMAT_FILE, OUTPUT_FORMAT_PRETTY, TABLE_SAMPLE_SIZE
+)
+from history import connect_history, save_run
+
+UNCHANGED_MESSAGE = (
+    'Результаты режима {mode} не изменились с прошлого запуска, '
+    'файл не создан.'
 )
+PAGE_PROMPT = 'Enter — следующая страница, q — выход: '
+QUIT_ANSWER = 'q'
+TRUNCATION_MARK = '…'
+WIDE_CHARACTERS = ('W', 'F')
 
 
 def default_output(results, *args, **kwargs):
@@ -15,18 +29,124 @@ def default_output(results, *args, **kwargs):
         print(*row)
 
 
-def pretty_output(results, *args, **kwargs):
-    table = PrettyTable()
-    table.field_names = results[0]
-    table.align = 'l'
-    table.add_rows(results[1:])
-    print(table)
+@lru_cache(maxsize=None)
+def get_char_width(char):
+    if unicodedata.combining(char):
+        return 0
+    if unicodedata.east_asian_width(char) in WIDE_CHARACTERS:
+        return 2
+    return 1
+
+
+def get_text_width(text):
+    if text.isascii():
+        return len(text)
+    return sum(map(get_char_width, text))
+
+
+def get_cell_lines(value):
+    return str(value).split('\n')
+
+
+def truncate(text, width):
+    kept, used = [], get_text_width(TRUNCATION_MARK)
+    for char in text:
+        used += get_char_width(char)
+        if used > width:
+            break
+        kept.append(char)
+    return ''.join(kept) + TRUNCATION_MARK
+
+
+def pad(text, width):
+    text_width = get_text_width(text)
+    if text_width > width:
+        text = truncate(text, width)
+        text_width = get_text_width(text)
+    return text + ' ' * (width - text_width)
+
+
+def get_column_widths(rows):
+    widths = [0] * len(rows[0])
+    for row in rows:
+        for index, value in enumerate(row):
+            widths[index] = max(
+                widths[index], *map(get_text_width, get_cell_lines(value))
+            )
+    return widths
+
+
+def format_border(widths):
+    return '+' + '+'.join('-' * (width + 2) for width in widths) + '+'
+
+
+def format_row(row, widths):
+    cells = [get_cell_lines(value) for value in row]
+    height = max(map(len, cells))
+    return '\n'.join(
+        '| ' + ' | '.join(
+            pad(lines[line] if line < len(lines) else '', width)
+            for lines, width in zip(cells, widths)
+        ) + ' |'
+        for line in range(height)
+    )
+
+
+def iter_pages(rows, page_size):
+    if not page_size:
+        yield rows
+        return
+    page = list(islice(rows, page_size))
+    while True:
+        yield page
+        page = list(islice(rows, page_size))
+        if not page:
+            return
+
+
+def continue_paging():
+    if not sys.stdout.isatty():
+        return True
+    try:
+        answer = input(PAGE_PROMPT)
+    except EOFError:
+        return False
+    return answer.strip().lower() != QUIT_ANSWER
+
+
+def pretty_output(results, cli_args=None, *args, **kwargs):
+    rows = iter(results)
+    header = next(rows)
+    sample = list(islice(rows, TABLE_SAMPLE_SIZE))
+    widths = get_column_widths(
+        results if isinstance(results, Sequence) else [header, *sample]
+    )
+    border = format_border(widths)
+    header_block = '\n'.join((border, format_row(header, widths), border))
+    pages = iter_pages(
+        chain(sample, rows), getattr(cli_args, 'page_size', None)
+    )
+    for number, page in enumerate(pages):
+        if number and not continue_paging():
+            return
+        print(header_block)
+        for row in page:
+            print(format_row(row, widths))
+        print(border)
 
 
 def file_output(results, cli_args):
     results_dir = BASE_DIR / RESULTS_DIR_NAME
     results_dir.mkdir(exist_ok=True)
     current_time = dt.datetime.now().strftime(DATETIME_FORMAT)
+    history_path = results_dir / HISTORY_FILE_NAME
+    with closing(connect_history(history_path)) as connection:
+        _, unchanged = save_run(
+            connection, cli_args.mode, current_time, results
+        )
+    if unchanged:
+        logging.info(UNCHANGED_MESSAGE.format(mode=cli_args.mode))
+        return
     file_name = f'{cli_args.mode}_{current_time}.csv'
     file_path = results_dir / file_name
     with open(file_path, 'w', encoding='utf-8') as file:
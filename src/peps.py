@@ -0,0 +1,229 @@
+import json
+import re
+import sqlite3
+from urllib.parse import urljoin
+
+from constants import EXPECTED_STATUS
+from specs import PEP_HEADER, PEP_INDEX, PEP_PAGE
+
+ERROR_JSON_UNEXPECTED = 'Неожиданный символ {!r} в позиции {} JSON-индекса'
+ERROR_JSON_TRUNCATED = 'JSON-индекс PEP оборвался до конца объекта'
+PEP_NUMBER_PATTERN = re.compile(r'pep-0*(\d+)')
+JSON_WHITESPACE = re.compile(r'\s*')
+VERSION_SEPARATOR = re.compile(r'[,\s]+')
+JSON_FIELDS = {'authors': 'author', 'delegate': 'pep_delegate'}
+PEP_HEADER_FIELDS = (
+    'author', 'sponsor', 'pep_delegate', 'discussions_to', 'status', 'type',
+    'topic', 'requires', 'created', 'python_version', 'post_history',
+    'replaces', 'superseded_by', 'resolution',
+)
+PEP_FIELDS = ('number', 'title', *PEP_HEADER_FIELDS)
+QUERY_FIELDS = ('status', 'type', 'python_version')
+INDEXED_FIELDS = ('status', 'type')
+SCHEMA = f'''
+CREATE TABLE IF NOT EXISTS peps (
+    number INTEGER PRIMARY KEY,
+    {', '.join(f'{field} TEXT' for field in PEP_FIELDS[1:])}
+);
+CREATE TABLE IF NOT EXISTS pep_versions (
+    version TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    PRIMARY KEY (version, number)
+);
+{''.join(
+    f'CREATE INDEX IF NOT EXISTS peps_{field} ON peps ({field});'
+    for field in INDEXED_FIELDS
+)}
+'''
+VERSION_CONDITION = (
+    'number IN (SELECT number FROM pep_versions WHERE version = ?)'
+)
+
+
+class PepRecord:
+    """Метаданные PEP из заголовка его страницы."""
+
+    __slots__ = PEP_FIELDS
+
+    def __init__(self, **fields):
+        for field in PEP_FIELDS:
+            setattr(self, field, fields.get(field))
+
+    def as_row(self):
+        return tuple(getattr(self, field) for field in PEP_FIELDS)
+
+
+class JsonObjectStream:
+    """Поочерёдно разбирает пары верхнего уровня JSON-объекта из потока."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+
+    def fill(self):
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self):
+        while True:
+            self.position = JSON_WHITESPACE.match(
+                self.buffer, self.position
+            ).end()
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                raise ValueError(ERROR_JSON_TRUNCATED)
+
+    def expect(self, *tokens):
+        token = self.peek()
+        if token not in tokens:
+            raise ValueError(
+                ERROR_JSON_UNEXPECTED.format(token, self.position)
+            )
+        self.position += 1
+        return token
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(
+                    self.buffer, self.position
+                )
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # Число на границе блока может продолжиться в следующем блоке.
+            if end < len(self.buffer) or not self.fill():
+                self.position = end
+                return value
+
+    def __iter__(self):
+        self.expect('{')
+        if self.peek() == '}':
+            return
+        while True:
+            key = self.decode()
+            self.expect(':')
+            yield key, self.decode()
+            if self.expect(',', '}') == '}':
+                return
+
+
+def get_pep_number(url):
+    match = PEP_NUMBER_PATTERN.search(url)
+    return int(match.group(1)) if match else None
+
+
+def get_expected_statuses(code):
+    return frozenset(EXPECTED_STATUS.get(code.strip()[1:2], ()))
+
+
+def parse_pep_index(soup, base_url):
+    entries = {}
+    for row in PEP_INDEX.extract(soup):
+        if row['code'] is None or row['href'] is None:
+            continue
+        url = urljoin(base_url, row['href'])
+        number = get_pep_number(url)
+        _, expected = entries.get(number, (url, frozenset()))
+        entries[number] = (url, expected | get_expected_statuses(row['code']))
+    return entries
+
+
+def get_header_field(label):
+    return label.strip().rstrip(':').lower().replace('-', '_')
+
+
+def parse_pep_page(soup, url):
+    fields = {
+        get_header_field(row['label']): row['value']
+        for row in PEP_HEADER.extract(soup) if row['value'] is not None
+    }
+    return PepRecord(
+        number=get_pep_number(url),
+        title=PEP_PAGE.extract(soup)['title'],
+        **{
+            field: value for field, value in fields.items()
+            if field in PEP_HEADER_FIELDS
+        }
+    )
+
+
+def parse_pep_json(key, entry):
+    fields = {
+        JSON_FIELDS.get(name, name): str(value)
+        for name, value in entry.items() if value not in (None, '')
+    }
+    number = int(fields.get('number', key))
+    title = fields.get('title')
+    return PepRecord(
+        number=number,
+        title=title and f'PEP {number} – {title}',
+        **{
+            field: value for field, value in fields.items()
+            if field in PEP_HEADER_FIELDS
+        }
+    )
+
+
+def connect_pep_store(store_path):
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(store_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def split_versions(python_version):
+    return [
+        version for version in VERSION_SEPARATOR.split(python_version or '')
+        if version
+    ]
+
+
+def save_pep_records(connection, records):
+    records = list(records)
+    with connection:
+        connection.executemany(
+            f'INSERT OR REPLACE INTO peps ({", ".join(PEP_FIELDS)}) '
+            f'VALUES ({", ".join("?" * len(PEP_FIELDS))})',
+            (record.as_row() for record in records)
+        )
+        connection.executemany(
+            'DELETE FROM pep_versions WHERE number = ?',
+            ((record.number,) for record in records)
+        )
+        connection.executemany(
+            'INSERT OR IGNORE INTO pep_versions (version, number) '
+            'VALUES (?, ?)',
+            (
+                (version, record.number) for record in records
+                for version in split_versions(record.python_version)
+            )
+        )
+
+
+def query_pep_records(connection, **filters):
+    conditions = {
+        field: value for field, value in filters.items()
+        if field in QUERY_FIELDS and value is not None
+    }
+    where = ' AND '.join(
+        VERSION_CONDITION if field == 'python_version' else f'{field} = ?'
+        for field in conditions
+    ) or '1'
+    return [
+        PepRecord(**dict(zip(PEP_FIELDS, row)))
+        for row in connection.execute(
+            f'SELECT {", ".join(PEP_FIELDS)} FROM peps '
+            f'WHERE {where} ORDER BY number',
+            list(conditions.values())
+        )
+    ]
@@ -0,0 +1,177 @@
+import html
+import re
+import sqlite3
+from collections import defaultdict
+
+from archives import iter_members, open_archive
+
+INDEXED_SUFFIXES = ('.html', '.htm', '.txt', '.rst')
+TOKEN_PATTERN = re.compile(r'\w+')
+TAG_PATTERN = re.compile(r'<(script|style)\b.*?</\1>|<[^>]+>', re.S | re.I)
+PHRASE_QUOTE = '"'
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    archive TEXT NOT NULL,
+    name TEXT NOT NULL,
+    crc INTEGER NOT NULL,
+    UNIQUE (archive, name)
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    document_id INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term, document_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_document ON postings (document_id);
+'''
+
+
+def connect_index(index_path):
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(index_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN_PATTERN.findall(text)]
+
+
+def get_document_text(data):
+    return html.unescape(TAG_PATTERN.sub(' ', data.decode('utf-8', 'replace')))
+
+
+def encode_positions(positions):
+    data = bytearray()
+    previous = 0
+    for position in positions:
+        delta, previous = position - previous, position
+        while delta >= 0x80:
+            data.append(delta & 0x7f | 0x80)
+            delta >>= 7
+        data.append(delta)
+    return bytes(data)
+
+
+def decode_positions(data):
+    positions = []
+    position = value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            position += value
+            positions.append(position)
+            value = shift = 0
+    return positions
+
+
+def get_postings(tokens):
+    postings = defaultdict(list)
+    for position, token in enumerate(tokens):
+        postings[token].append(position)
+    return postings
+
+
+def delete_documents(connection, document_ids):
+    rows = [(document_id,) for document_id in document_ids]
+    connection.executemany(
+        'DELETE FROM postings WHERE document_id = ?', rows
+    )
+    connection.executemany('DELETE FROM documents WHERE id = ?', rows)
+
+
+def index_document(connection, archive_name, info, data):
+    cursor = connection.execute(
+        'INSERT INTO documents (archive, name, crc) VALUES (?, ?, ?)',
+        (archive_name, info.filename, info.CRC)
+    )
+    connection.executemany(
+        'INSERT INTO postings (term, document_id, positions) '
+        'VALUES (?, ?, ?)',
+        (
+            (term, cursor.lastrowid, encode_positions(positions))
+            for term, positions in get_postings(
+                tokenize(get_document_text(data))
+            ).items()
+        )
+    )
+
+
+def update_index(connection, archive_path):
+    known = {
+        name: (document_id, crc)
+        for document_id, name, crc in connection.execute(
+            'SELECT id, name, crc FROM documents WHERE archive = ?',
+            (archive_path.name,)
+        )
+    }
+    updated = 0
+    with connection, open_archive(archive_path) as archive:
+        for info in iter_members(archive):
+            if not info.filename.endswith(INDEXED_SUFFIXES):
+                continue
+            document_id, crc = known.pop(info.filename, (None, None))
+            if crc == info.CRC:
+                continue
+            if document_id is not None:
+                delete_documents(connection, [document_id])
+            index_document(
+                connection, archive_path.name, info, archive.read(info)
+            )
+            updated += 1
+        delete_documents(
+            connection, [document_id for document_id, _ in known.values()]
+        )
+    return updated, len(known)
+
+
+def get_term_positions(connection, term):
+    return {
+        document_id: decode_positions(positions)
+        for document_id, positions in connection.execute(
+            'SELECT document_id, positions FROM postings WHERE term = ?',
+            (term,)
+        )
+    }
+
+
+def count_phrase(positions_by_term):
+    candidates = set(positions_by_term[0])
+    for offset, positions in enumerate(positions_by_term[1:], start=1):
+        candidates &= {position - offset for position in positions}
+    return len(candidates)
+
+
+def match_documents(connection, terms, phrase):
+    postings = [get_term_positions(connection, term) for term in terms]
+    document_ids = set.intersection(*(set(found) for found in postings))
+    matches = {}
+    for document_id in document_ids:
+        positions_by_term = [found[document_id] for found in postings]
+        count = (
+            count_phrase(positions_by_term) if phrase
+            else min(len(positions) for positions in positions_by_term)
+        )
+        if count:
+            matches[document_id] = count
+    return matches
+
+
+def search_index(connection, query):
+    phrase = query.startswith(PHRASE_QUOTE) and query.endswith(PHRASE_QUOTE)
+    terms = tokenize(query)
+    if not terms:
+        return []
+    matches = match_documents(connection, terms, phrase)
+    names = dict(connection.execute(
+        'SELECT id, archive || \'/\' || name FROM documents WHERE id IN '
+        f'({", ".join("?" * len(matches))})',
+        list(matches)
+    ))
+    return sorted(
+        ((names[document_id], count)
+         for document_id, count in matches.items()),
+        key=lambda row: (-row[1], row[0])
+    )
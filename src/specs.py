@@ -0,0 +1,121 @@
+import soupsieve
+
+from constants import DOWNLOAD_FORMATS
+from exceptions import ParserFindTagException
+
+ERROR_SELECTOR_NOT_FOUND = 'Не найден тег по селектору {}'
+
+
+class Selector:
+    """CSS-селектор, скомпилированный один раз при загрузке модуля."""
+
+    __slots__ = ('css', 'compiled')
+
+    def __init__(self, css):
+        self.css = css
+        self.compiled = soupsieve.compile(css)
+
+    def select(self, tag):
+        return self.compiled.select(tag)
+
+    def select_one(self, tag):
+        return self.compiled.select_one(tag)
+
+    def find(self, tag):
+        found = self.compiled.select_one(tag)
+        if found is None:
+            raise ParserFindTagException(
+                ERROR_SELECTOR_NOT_FOUND.format(self.css)
+            )
+        return found
+
+
+class Field:
+    """Значение, извлекаемое из строки спецификации."""
+
+    __slots__ = ('selector', 'attribute', 'required', 'default', 'sibling')
+
+    def __init__(
+        self, css=None, attribute=None, required=True, default=None,
+        sibling=None
+    ):
+        self.selector = Selector(css) if css else None
+        self.attribute = attribute
+        self.required = required
+        self.default = default
+        self.sibling = sibling
+
+    def extract(self, tag):
+        if self.sibling is not None:
+            tag = tag.find_next_sibling()
+            if tag is not None and tag.name != self.sibling:
+                tag = None
+        if self.selector is not None and tag is not None:
+            tag = (
+                self.selector.find(tag) if self.required
+                else self.selector.select_one(tag)
+            )
+        if tag is None:
+            return self.default
+        if self.attribute is not None:
+            return tag.get(self.attribute, self.default)
+        return ' '.join(tag.text.split())
+
+
+class ExtractionSpec:
+    """Описание извлечения: обязательный корень, строки и поля строки."""
+
+    __slots__ = ('root', 'rows', 'fields')
+
+    def __init__(self, root=None, rows=None, **fields):
+        self.root = Selector(root) if root else None
+        self.rows = Selector(rows) if rows else None
+        self.fields = fields
+
+    def extract_row(self, tag):
+        return {
+            name: field.extract(tag) for name, field in self.fields.items()
+        }
+
+    def extract(self, soup):
+        root = self.root.find(soup) if self.root is not None else soup
+        if self.rows is None:
+            return self.extract_row(root)
+        return [self.extract_row(row) for row in self.rows.select(root)]
+
+
+WHATS_NEW_INDEX = ExtractionSpec(
+    root='section#what-s-new-in-python',
+    rows='div.toctree-wrapper.compound',
+    version=Field('h2', required=False),
+    href=Field('a[href]', attribute='href'),
+)
+WHATS_NEW_PAGE = ExtractionSpec(
+    author=Field('p.author', required=False),
+)
+LATEST_VERSIONS = ExtractionSpec(
+    root='div.sphinxsidebarwrapper',
+    rows='ul:-soup-contains("All versions") a[href]',
+    href=Field(attribute='href'),
+    version=Field(),
+)
+PEP_INDEX = ExtractionSpec(
+    rows='#pep-content tr',
+    code=Field('td', required=False),
+    href=Field('td a[href*="pep-"]', attribute='href', required=False),
+)
+PEP_PAGE = ExtractionSpec(
+    title=Field('h1.page-title', required=False),
+)
+PEP_HEADER = ExtractionSpec(
+    root='dl.rfc2822',
+    rows=':scope > dt',
+    label=Field(),
+    value=Field(sibling='dd'),
+)
+DOWNLOAD_ARCHIVES = {
+    archive_format: Selector(
+        f'div[role="main"] table.docutils a[href$="{suffix}"]'
+    )
+    for archive_format, suffix in DOWNLOAD_FORMATS.items()
+}
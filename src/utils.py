@@ -1,15 +1,41 @@
+import time
+from contextlib import contextmanager, nullcontext
+
 from bs4 import BeautifulSoup
 from requests import RequestException
 
-from exceptions import ParserFindTagException
+from constants import CONNECT_TIMEOUT, READ_TIMEOUT
+from exceptions import DeadlineExceededException, ParserFindTagException
 
 ERROR_LOAD_PAGE = 'Возникла ошибка при загрузке страницы {}: {}'
 ERROR_TAG_NOT_FOUND = 'Не найден тег {} {}'
+ERROR_DEADLINE_EXCEEDED = 'Истекло время работы, страница не загружена: {}'
+
+
+def get_timeout(session, url):
+    connect_timeout, read_timeout = getattr(
+        session, 'timeout', (CONNECT_TIMEOUT, READ_TIMEOUT)
+    )
+    deadline = getattr(session, 'deadline', None)
+    if deadline is None:
+        return connect_timeout, read_timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceededException(ERROR_DEADLINE_EXCEEDED.format(url))
+    return min(connect_timeout, remaining), min(read_timeout, remaining)
+
+
+def send_request(session, url, **kwargs):
+    hedger = getattr(session, 'hedger', None)
+    if hedger is None or kwargs.get('stream'):
+        return session.get(url, **kwargs)
+    return hedger.get(session, url, **kwargs)
 
 
-def get_response(session, url, encoding='utf-8'):
+def get_response(session, url, encoding='utf-8', **kwargs):
+    kwargs.setdefault('timeout', get_timeout(session, url))
     try:
-        response = session.get(url)
+        response = send_request(session, url, **kwargs)
         response.encoding = encoding
         return response
     except RequestException as e:
@@ -31,5 +57,23 @@ def find_tag(soup, tag, attrs=None):
     return searched_tag
 
 
-def get_soup(session, url, parser='lxml'):
-    return BeautifulSoup(get_response(session, url).text, parser)
+def get_soup(session, url, parser='lxml', encoding='utf-8'):
+    response = get_response(session, url, encoding)
+    return BeautifulSoup(
+        response.content, parser, from_encoding=response.encoding
+    )
+
+
+def page_slot(session):
+    return getattr(session, 'page_slots', None) or nullcontext()
+
+
+@contextmanager
+def page_soup(session, url, parser='lxml'):
+    with page_slot(session):
+        soup = get_soup(session, url, parser)
+        try:
+            yield soup
+        finally:
+            if getattr(session, 'page_slots', None) is not None:
+                soup.decompose()
@@ -0,0 +1,144 @@
+import datetime as dt
+import io
+import threading
+import uuid
+
+from requests import ConnectionError as RequestsConnectionError
+from requests.adapters import HTTPAdapter
+from requests_cache import OriginalResponse
+from urllib3 import HTTPResponse
+
+ERROR_NOT_RECORDED = 'Ответ для {} отсутствует в архиве {}'
+WARC_VERSION = 'WARC/1.0'
+CRLF = b'\r\n'
+RECORD_END = CRLF * 2
+RESPONSE_RECORD = 'response'
+RECORDED_METHOD = 'GET'
+PARTIAL_CONTENT = 206
+SKIPPED_HEADERS = ('content-encoding', 'transfer-encoding', 'content-length')
+
+
+def format_http_block(response):
+    lines = [f'HTTP/1.1 {response.status_code} {response.reason or ""}']
+    lines.extend(
+        f'{name}: {value}' for name, value in response.headers.items()
+        if name.lower() not in SKIPPED_HEADERS
+    )
+    lines.append(f'Content-Length: {len(response.content)}')
+    return (
+        '\r\n'.join(lines).encode('utf-8') + RECORD_END + response.content
+    )
+
+
+def format_record(url, block):
+    headers = (
+        WARC_VERSION,
+        f'WARC-Type: {RESPONSE_RECORD}',
+        f'WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>',
+        f'WARC-Date: {dt.datetime.now(dt.timezone.utc):%Y-%m-%dT%H:%M:%SZ}',
+        f'WARC-Target-URI: {url}',
+        'Content-Type: application/http; msgtype=response',
+        f'Content-Length: {len(block)}',
+    )
+    return (
+        '\r\n'.join(headers).encode('utf-8')
+        + RECORD_END + block + RECORD_END
+    )
+
+
+class WarcWriter:
+    """Дописывает полученные ответы в WARC-файл."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def record_response(self, response, *args, **kwargs):
+        request = response.request
+        if (
+            request.method != RECORDED_METHOD
+            or response.status_code == PARTIAL_CONTENT
+            or isinstance(response, OriginalResponse)
+        ):
+            return response
+        record = format_record(request.url, format_http_block(response))
+        with self.lock, open(self.path, 'ab') as file:
+            file.write(record)
+        return response
+
+
+def read_headers(file):
+    headers = {}
+    for line in iter(file.readline, CRLF):
+        if not line:
+            break
+        name, _, value = line.decode('utf-8').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def index_records(path):
+    records = {}
+    with open(path, 'rb') as file:
+        while file.readline().strip() == WARC_VERSION.encode():
+            headers = read_headers(file)
+            length = int(headers['content-length'])
+            if headers.get('warc-type') == RESPONSE_RECORD:
+                records[headers['warc-target-uri']] = (file.tell(), length)
+            file.seek(length + len(RECORD_END), 1)
+    return records
+
+
+def parse_http_block(block):
+    head, _, body = block.partition(RECORD_END)
+    status_line, *header_lines = head.decode('utf-8').split('\r\n')
+    _, status_code, reason = (status_line.split(' ', 2) + [''])[:3]
+    headers = [line.split(': ', 1) for line in header_lines if line]
+    return int(status_code), reason, headers, body
+
+
+class WarcReplayAdapter(HTTPAdapter):
+    """Отдаёт ответы из WARC-файла без обращения к сети."""
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.records = index_records(path)
+
+    def read_block(self, url):
+        if url not in self.records:
+            raise RequestsConnectionError(
+                ERROR_NOT_RECORDED.format(url, self.path)
+            )
+        offset, length = self.records[url]
+        with open(self.path, 'rb') as file:
+            file.seek(offset)
+            return file.read(length)
+
+    def send(self, request, **kwargs):
+        status_code, reason, headers, body = parse_http_block(
+            self.read_block(request.url)
+        )
+        raw = HTTPResponse(
+            body=io.BytesIO(body),
+            headers=headers,
+            status=status_code,
+            reason=reason,
+            preload_content=False,
+            request_url=request.url,
+        )
+        return self.build_response(request, raw)
+
+
+def record_session(session, path):
+    session.hooks['response'].append(WarcWriter(path).record_response)
+    session.warc_path = path
+    return session
+
+
+def replay_session(session, path):
+    adapter = WarcReplayAdapter(path)
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, adapter)
+    session.warc_path = path
+    return session
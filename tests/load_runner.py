@@ -0,0 +1,105 @@
+import argparse
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from functools import partial
+from pathlib import Path
+
+from requests_cache import CachedSession, OriginalResponse
+
+from synthetic_server import SyntheticSite
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+sys.path.append(str(SRC_DIR))
+
+import main  # noqa: E402
+
+DEFAULT_SIZES = (10_000, 30_000, 100_000)
+PERCENTILES = (0.5, 0.95, 0.99)
+MODES = {
+    'pep': main.pep,
+    'whats-new': main.whats_new,
+}
+REPORT_HEADER = (
+    'Размер', 'Запросов', 'Время, с', 'Запросов/с',
+    *(f'p{int(percentile * 100)}, мс' for percentile in PERCENTILES),
+    'Пик памяти, МиБ',
+)
+
+
+def configure_argument_parser():
+    parser = argparse.ArgumentParser(
+        description='Нагрузочный прогон парсера на синтетическом сайте'
+    )
+    parser.add_argument('mode', choices=MODES)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--max-pages', type=int)
+    parser.add_argument('--backend', choices=main.PEP_BACKENDS)
+    parser.add_argument('--sample', type=int)
+    return parser
+
+
+def get_percentile(values, percentile):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[int(percentile * (len(values) - 1))]
+
+
+def record_latency(latencies, response, *args, **kwargs):
+    # requests-cache повторно вызывает хуки для уже полученного ответа.
+    if not isinstance(response, OriginalResponse):
+        latencies.append(response.elapsed.total_seconds())
+    return response
+
+
+def run(mode, size, cli_args):
+    site_options = {'pep_count': size} if mode == 'pep' else {
+        'version_count': size
+    }
+    with SyntheticSite(
+        latency=cli_args.latency, error_rate=cli_args.error_rate,
+        **site_options
+    ) as site, tempfile.TemporaryDirectory() as base_dir:
+        main.PEP_INDEX_URL = site.pep_index_url
+        main.MAIN_DOC_URL = site.main_doc_url
+        main.BASE_DIR = Path(base_dir)
+        session = CachedSession(backend='memory')
+        if cli_args.max_pages:
+            session.page_slots = threading.BoundedSemaphore(
+                cli_args.max_pages
+            )
+        latencies = []
+        session.hooks['response'].append(
+            partial(record_latency, latencies)
+        )
+        tracemalloc.start()
+        started = time.perf_counter()
+        MODES[mode](session, cli_args)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return (
+        size, len(latencies), round(elapsed, 2),
+        round(len(latencies) / elapsed, 1),
+        *(
+            round(get_percentile(latencies, percentile) * 1000, 2)
+            for percentile in PERCENTILES
+        ),
+        round(peak / 1024 ** 2, 1),
+    )
+
+
+def main_load():
+    cli_args = configure_argument_parser().parse_args()
+    print(*REPORT_HEADER, sep='\t')
+    for size in cli_args.sizes:
+        print(*run(cli_args.mode, size, cli_args), sep='\t', flush=True)
+
+
+if __name__ == '__main__':
+    main_load()
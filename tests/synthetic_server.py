@@ -0,0 +1,194 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PEP_INDEX_PATH = '/peps/'
+MAIN_DOC_PATH = '/docs/'
+PEP_JSON_PATH = PEP_INDEX_PATH + 'api/peps.json'
+WHATS_NEW_PATH = MAIN_DOC_PATH + 'whatsnew/'
+INDEX_PATHS = (PEP_INDEX_PATH, PEP_JSON_PATH, WHATS_NEW_PATH)
+STATUSES = (
+    ('A', 'Active'), ('A', 'Accepted'), ('D', 'Deferred'), ('F', 'Final'),
+    ('P', 'Provisional'), ('R', 'Rejected'), ('S', 'Superseded'),
+    ('W', 'Withdrawn'), ('', 'Draft'),
+)
+TYPES = (('S', 'Standards Track'), ('I', 'Informational'), ('P', 'Process'))
+INCONSISTENT_EVERY = 50
+
+
+def get_pep_status(number):
+    return STATUSES[number % len(STATUSES)]
+
+
+def get_pep_type(number):
+    return TYPES[number % len(TYPES)]
+
+
+def render_pep_index(pep_count):
+    rows = []
+    for number in range(1, pep_count + 1):
+        code, _ = get_pep_status(number)
+        if number % INCONSISTENT_EVERY == 0:
+            code = 'R' if code != 'R' else 'F'
+        rows.append(
+            f'<tr><td><abbr>{get_pep_type(number)[0]}{code}</abbr></td>'
+            f'<td><a href="pep-{number:04d}/">{number}</a></td>'
+            f'<td><a href="pep-{number:04d}/">Synthetic PEP {number}</a></td>'
+            '<td>Автор</td></tr>'
+        )
+    return (
+        '<html><body><section id="pep-content"><table><tbody>'
+        f'{"".join(rows)}</tbody></table></section></body></html>'
+    )
+
+
+def render_pep_json(pep_count, base_url):
+    return json.dumps({
+        str(number): {
+            'number': number,
+            'title': f'Synthetic PEP {number}',
+            'authors': 'Автор',
+            'status': get_pep_status(number)[1],
+            'type': get_pep_type(number)[1],
+            'created': '01-Jan-2000',
+            'python_version': f'3.{number % 15}',
+            'superseded_by': None,
+            'url': f'{base_url}{PEP_INDEX_PATH}pep-{number:04d}/',
+        }
+        for number in range(1, pep_count + 1)
+    }, ensure_ascii=False)
+
+
+def render_pep_page(number):
+    return (
+        f'<html><body><h1 class="page-title">PEP {number} – '
+        f'Synthetic PEP {number}</h1><dl class="rfc2822 field-list simple">'
+        '<dt>Author<span class="colon">:</span></dt><dd>Автор</dd>'
+        f'<dt>Status<span class="colon">:</span></dt>'
+        f'<dd><abbr>{get_pep_status(number)[1]}</abbr></dd>'
+        f'<dt>Type<span class="colon">:</span></dt>'
+        f'<dd><abbr>{get_pep_type(number)[1]}</abbr></dd>'
+        '<dt>Created<span class="colon">:</span></dt><dd>01-Jan-2000</dd>'
+        f'<dt>Python-Version<span class="colon">:</span></dt>'
+        f'<dd>3.{number % 15}</dd></dl>'
+        f'<p>{"Текст PEP. " * 200}</p></body></html>'
+    )
+
+
+def render_whats_new_index(version_count):
+    sections = ''.join(
+        '<div class="toctree-wrapper compound">'
+        f'<h2>Python 3.{version}</h2>'
+        f'<a href="3.{version}.html">What\'s New In Python 3.{version}</a>'
+        '</div>'
+        for version in range(version_count)
+    )
+    return (
+        '<html><body><section id="what-s-new-in-python">'
+        f'{sections}</section></body></html>'
+    )
+
+
+def render_whats_new_page(version):
+    return (
+        f'<html><body><h1>What\'s New In Python {version}</h1>'
+        f'<p class="author">Editor {version}</p>'
+        f'<p>{"Изменения. " * 500}</p></body></html>'
+    )
+
+
+class SyntheticSite:
+    """Локальный сервер синтетических страниц PEP и документации."""
+
+    def __init__(
+        self, pep_count=100, version_count=20, latency=0.0, error_rate=0.0,
+        seed=0
+    ):
+        self.pep_count = pep_count
+        self.version_count = version_count
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.random_lock = threading.Lock()
+        self.pep_index = render_pep_index(pep_count).encode('utf-8')
+        self.server = ThreadingHTTPServer(
+            ('127.0.0.1', 0), self.make_handler()
+        )
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    @property
+    def pep_index_url(self):
+        return self.base_url + PEP_INDEX_PATH
+
+    @property
+    def main_doc_url(self):
+        return self.base_url + MAIN_DOC_PATH
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def should_fail(self):
+        with self.random_lock:
+            return self.random.random() < self.error_rate
+
+    def render(self, path):
+        if path == PEP_INDEX_PATH:
+            return self.pep_index
+        if path == PEP_JSON_PATH:
+            return render_pep_json(
+                self.pep_count, self.base_url
+            ).encode('utf-8')
+        if path.startswith(PEP_INDEX_PATH + 'pep-'):
+            number = int(path[len(PEP_INDEX_PATH + 'pep-'):].strip('/'))
+            if 0 < number <= self.pep_count:
+                return render_pep_page(number).encode('utf-8')
+        if path == WHATS_NEW_PATH:
+            return render_whats_new_index(self.version_count).encode('utf-8')
+        if path.startswith(WHATS_NEW_PATH + '3.'):
+            version = path[len(WHATS_NEW_PATH):-len('.html')]
+            return render_whats_new_page(version).encode('utf-8')
+        return None
+
+    def make_handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if site.latency:
+                    time.sleep(site.latency)
+                if self.path not in INDEX_PATHS and site.should_fail():
+                    self.send_error(500)
+                    return
+                body = site.render(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header(
+                    'Content-Type',
+                    'application/json' if self.path == PEP_JSON_PATH
+                    else 'text/html; charset=utf-8'
+                )
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,63 @@
+import zipfile
+
+import pytest
+try:
+    from src import archives
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `archives.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `archives.py`'
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = tmp_path / 'python-docs-html.zip'
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('python-docs-html/index.html', '<h1>Python</h1>')
+        archive.writestr('python-docs-html/library/re.html', 'regex' * 100)
+        archive.writestr('python-docs-html/_static/basic.css', 'body {}')
+    return path
+
+
+def test_get_manifest(archive_path):
+    got = archives.get_manifest(archive_path)
+    assert [row[0] for row in got] == [
+        'python-docs-html/index.html',
+        'python-docs-html/library/re.html',
+        'python-docs-html/_static/basic.css',
+    ], 'Манифест должен содержать все файлы архива'
+    name, size, compress_size, crc = got[1]
+    assert size == 500 and compress_size < size, (
+        'Манифест должен содержать исходный и сжатый размеры файла'
+    )
+    assert crc == f'{zipfile.crc32(b"regex" * 100):08x}', (
+        'Манифест должен содержать CRC32 файла'
+    )
+
+
+def test_extract_matching(archive_path, tmp_path):
+    target_dir = tmp_path / 'extracted'
+    got = archives.extract_matching(archive_path, '*.html', target_dir)
+    assert sorted(path.name for path in got) == ['index.html', 're.html'], (
+        'Должны извлекаться только файлы, подходящие под шаблон'
+    )
+    assert not list(target_dir.glob('**/*.css'))
+    assert (
+        target_dir / 'python-docs-html/library/re.html'
+    ).read_text() == 'regex' * 100
+
+
+def test_extract_unsafe_member(tmp_path):
+    path = tmp_path / 'unsafe.zip'
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('../escape.txt', 'data')
+    with pytest.raises(ValueError):
+        archives.extract_matching(path, '*', tmp_path / 'extracted')
+
+
+def test_open_corrupt_archive(tmp_path):
+    path = tmp_path / 'python-docs-text.zip'
+    path.write_bytes(b'PK\x03\x04')
+    with pytest.raises(zipfile.BadZipFile):
+        with archives.open_archive(path):
+            pass
@@ -0,0 +1,104 @@
+import re
+import threading
+import time
+
+import pytest
+
+try:
+    from src import downloads
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloads.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloads.py`'
+
+ARCHIVE_URL = 'mock://docs.python.org/3/archives/python-docs-html.zip'
+ARCHIVE_CONTENT = bytes(range(256)) * 1000
+
+
+def range_callback(request, context):
+    start, end = map(
+        int, re.match(r'bytes=(\d+)-(\d+)', request.headers['Range']).groups()
+    )
+    context.status_code = 206
+    context.headers['Content-Range'] = (
+        f'bytes {start}-{end}/{len(ARCHIVE_CONTENT)}'
+    )
+    return ARCHIVE_CONTENT[start:end + 1]
+
+
+def short_range_callback(request, context):
+    return range_callback(request, context)[:100]
+
+
+def register_archive(adapter, url, callback):
+    adapter.register_uri(
+        'HEAD', url,
+        headers={
+            'Accept-Ranges': 'bytes',
+            'Content-Length': str(len(ARCHIVE_CONTENT)),
+        },
+    )
+    adapter.register_uri('GET', url, content=callback)
+
+
+def test_split_segments():
+    assert downloads.split_segments(10, segment_size=4) == [
+        (0, 3), (4, 7), (8, 9)
+    ], 'Сегменты должны покрывать весь файл без пересечений'
+
+
+def test_download_segmented(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(downloads, 'SEGMENT_SIZE', 4096)
+    monkeypatch.setattr(downloads, 'SEGMENT_THRESHOLD', 8192)
+    register_archive(mock_session.mock_adapter, ARCHIVE_URL, range_callback)
+    path = downloads.download_file(mock_session, ARCHIVE_URL, tmp_path)
+    assert path.read_bytes() == ARCHIVE_CONTENT, (
+        'Архив, собранный из сегментов, должен совпадать с исходным'
+    )
+    assert not list(tmp_path.glob('*.part')), (
+        'После загрузки не должно оставаться временных файлов'
+    )
+
+
+def test_download_short_segment(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(downloads, 'SEGMENT_SIZE', 4096)
+    monkeypatch.setattr(downloads, 'SEGMENT_THRESHOLD', 8192)
+    register_archive(
+        mock_session.mock_adapter, ARCHIVE_URL, short_range_callback
+    )
+    with pytest.raises(ConnectionError):
+        downloads.download_file(mock_session, ARCHIVE_URL, tmp_path)
+    assert not list(tmp_path.iterdir()), (
+        'Неполный архив не должен сохраняться'
+    )
+
+
+def test_download_files_concurrency(monkeypatch, tmp_path, mock_session):
+    monkeypatch.setattr(downloads, 'SEGMENT_SIZE', 4096)
+    monkeypatch.setattr(downloads, 'SEGMENT_THRESHOLD', 8192)
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def slow_range_callback(request, context):
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.005)
+        with lock:
+            active[0] -= 1
+        return range_callback(request, context)
+
+    urls = [ARCHIVE_URL, ARCHIVE_URL.replace('html', 'text')]
+    for url in urls:
+        register_archive(mock_session.mock_adapter, url, slow_range_callback)
+    downloads.download_files(mock_session, urls, tmp_path, workers=2)
+    assert active[1] <= 2, (
+        'Число одновременных загрузок не должно превышать `--workers`'
+    )
+
+
+def test_download_without_ranges(tmp_path, mock_session):
+    path = downloads.download_file(mock_session, ARCHIVE_URL, tmp_path)
+    assert path.read_bytes() == b'You are breathtaken', (
+        'Без поддержки Range файл должен загружаться целиком'
+    )
@@ -0,0 +1,66 @@
+import threading
+import time
+try:
+    from src import hedging
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `hedging.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `hedging.py`'
+
+
+class SlowFirstSession:
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get(self, url, **kwargs):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        time.sleep(2 if call == 1 else 0.01)
+        return call
+
+
+def test_hedged_request_cuts_tail(caplog):
+    hedger = hedging.Hedger(min_samples=3)
+    hedger.latencies.extend([0.01, 0.02, 0.03])
+    session = SlowFirstSession()
+    started = time.monotonic()
+    got = hedger.get(session, 'mock://peps.python.org/pep-0008/')
+    assert got == 2, 'Должен вернуться ответ на дублирующий запрос'
+    assert time.monotonic() - started < 1, (
+        'Дублирующий запрос должен отправляться после p95 задержки'
+    )
+    assert session.calls == 2
+    hedger.executor.shutdown(wait=True)
+    assert not [
+        record for record in caplog.records if record.levelname == 'ERROR'
+    ], 'Дублирующий запрос без --max-pages не должен приводить к ошибкам'
+
+
+def test_hedging_respects_page_slots():
+    hedger = hedging.Hedger(min_samples=3)
+    hedger.latencies.extend([0.01, 0.02, 0.03])
+    session = SlowFirstSession()
+    session.page_slots = threading.BoundedSemaphore(1)
+    with session.page_slots:
+        got = hedger.get(session, 'mock://peps.python.org/pep-0008/')
+    assert (got, session.calls) == (1, 1), (
+        'Дублирующий запрос не должен превышать лимит --max-pages'
+    )
+
+
+def test_no_hedging_without_samples():
+    hedger = hedging.Hedger()
+    assert hedger.get_delay() is None
+    assert hedger.get(SlowFirstSession(), 'mock://docs.python.org/') == 1
+
+
+def test_cache_hits_not_sampled(mock_session):
+    hedger = hedging.Hedger(min_samples=3)
+    for _ in range(30):
+        hedger.get(mock_session, 'mock://docs.python.org/')
+    assert len(hedger.latencies) == 1, (
+        'Ответы из кеша не должны учитываться в задержках'
+    )
+    assert hedger.get_delay() is None
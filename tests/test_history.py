@@ -0,0 +1,52 @@
+from contextlib import closing
+
+import pytest
+try:
+    from src import history
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `history.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `history.py`'
+
+HEADER = ('Статус', 'Количество')
+
+
+def make_results(count, changed=None):
+    rows = [(f'Status {index}', index) for index in range(count)]
+    if changed is not None:
+        rows[changed] = (f'Status {changed}', -1)
+    return [HEADER, *rows]
+
+
+@pytest.fixture
+def connection(tmp_path):
+    path = tmp_path / 'results' / 'history.sqlite3'
+    with closing(history.connect_history(path)) as conn:
+        yield conn
+
+
+def test_identical_runs_are_deduplicated(connection):
+    results = make_results(500)
+    first, unchanged = history.save_run(connection, 'pep', '1', results)
+    assert not unchanged
+    second, unchanged = history.save_run(connection, 'pep', '2', results)
+    assert unchanged, 'Повторный запуск с теми же данными должен распознаваться'
+    (rows,), = connection.execute('SELECT COUNT(*) FROM rows')
+    assert rows == len(results), 'Одинаковые строки должны храниться один раз'
+    assert history.diff_runs(connection, first, second) == []
+    assert [run[0] for run in history.list_runs(connection, 'pep')] == [
+        first, second
+    ]
+
+
+def test_diff_runs(connection):
+    first, _ = history.save_run(connection, 'pep', '1', make_results(500))
+    second, _ = history.save_run(
+        connection, 'pep', '2', make_results(500, changed=250)
+    )
+    assert history.diff_runs(connection, first, second) == [
+        ('-', 'Status 250', 250), ('+', 'Status 250', -1)
+    ], 'Разница должна содержать только изменённые строки'
+    assert history.get_run_header(connection, second) == HEADER
+    with pytest.raises(ValueError):
+        history.diff_runs(connection, first, 100)
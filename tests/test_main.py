@@ -1,5 +1,11 @@
+import threading
+import time
+import zipfile
+
 import pytest
+import requests_mock
 from pathlib import Path
+from argparse import Namespace
 try:
     from src import main
 except ModuleNotFoundError:
@@ -112,6 +118,128 @@ def test_download(monkeypatch, tmp_path, mock_session):
     )
 
 
+WHATS_NEW_PAGE = '''
+<section id="what-s-new-in-python">
+<div class="toctree-wrapper compound">
+<h2>Python 3.12</h2><a href="3.12.html">What's New In Python 3.12</a>
+</div>
+</section>
+'''
+PEP_INDEX_PAGE = '''
+<section id="pep-content"><table>
+<tr><td>PA</td><td><a href="pep-0001/">1</a></td></tr>
+<tr><td>SF</td><td><a href="pep-0008/">8</a></td></tr>
+</table></section>
+'''
+
+
+def test_prefetch(mock_session):
+    with requests_mock.Mocker() as mock:
+        mock.get(requests_mock.ANY, text='')
+        mock.get(main.MAIN_DOC_URL + 'whatsnew/', text=WHATS_NEW_PAGE)
+        mock.get(main.PEP_INDEX_URL, text=PEP_INDEX_PAGE)
+        first = main.prefetch(mock_session)
+        second = main.prefetch(mock_session)
+    assert first == [
+        ('Результат', 'Количество'), ('Загружено', 6), ('Total', 6)
+    ], (
+        'Режим `prefetch` должен загрузить главную страницу, страницу '
+        'загрузок, JSON-индекс PEP, статьи «Что нового» и страницы всех PEP'
+    )
+    assert second == [
+        ('Результат', 'Количество'), ('Уже в кеше', 6), ('Total', 6)
+    ], 'После `prefetch` все страницы должны отдаваться из кеша'
+
+
+PEP_JSON = (
+    '{"8": {"number": 8, "title": "Style Guide", "status": "Active", '
+    '"url": "https://peps.python.org/pep-0008/"}, '
+    '"9999": {"number": 9999, "title": "Joke", "status": "April Fool!"}}'
+)
+PEP_8_PAGE = (
+    '<h1 class="page-title">PEP 8 – Style Guide</h1>'
+    '<dl class="rfc2822"><dt>Status:</dt><dd>Final</dd></dl>'
+)
+
+
+def test_pep_json(mock_session, monkeypatch, tmp_path, caplog):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    with requests_mock.Mocker() as mock:
+        mock.get(main.PEP_INDEX_URL + 'api/peps.json', text=PEP_JSON)
+        mock.get(main.PEP_INDEX_URL + 'pep-0008/', text=PEP_8_PAGE)
+        mock.get(main.PEP_INDEX_URL + 'pep-9999/', status_code=404)
+        got = main.pep(mock_session, Namespace(backend='json', sample=2))
+    assert got == [
+        ('Статус', 'Количество'), ('Active', 1), ('April Fool!', 1),
+        ('Total', 2)
+    ], 'Режим `pep` с JSON-индексом должен посчитать статусы всех PEP'
+    assert 'Неизвестный статус April Fool!' in caplog.text
+    assert 'Ожидаемый статус: Active' in caplog.text, (
+        'Выборочная проверка должна сообщать о расхождениях со страницами'
+    )
+    assert mock.call_count == 3
+
+
+def test_prefetch_page_slots(mock_session):
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def slow_page(request, context):
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return ''
+
+    adapter = mock_session.mock_adapter
+    mock_session.mount('https://', adapter)
+    adapter.register_uri('GET', requests_mock.ANY, text=slow_page)
+    adapter.register_uri(
+        'GET', main.MAIN_DOC_URL + 'whatsnew/', text=WHATS_NEW_PAGE
+    )
+    adapter.register_uri('GET', main.PEP_INDEX_URL, text=PEP_INDEX_PAGE)
+    mock_session.page_slots = threading.BoundedSemaphore(2)
+    main.prefetch(mock_session, Namespace(workers=4))
+    assert active[1] <= 2, (
+        'С `--max-pages` одновременно загружается не больше N страниц'
+    )
+
+
+@pytest.mark.parametrize('mode, cli_arg', [
+    ('whats-new', None),
+    ('latest-versions', None),
+    ('prefetch', None),
+    ('pep', Namespace(backend='html')),
+    ('pep', Namespace(backend='json')),
+    ('download', None),
+])
+def test_deadline_before_index(mock_session, monkeypatch, tmp_path, mode,
+                               cli_arg):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    mock_session.deadline = time.monotonic() - 1
+    got = main.MODE_TO_FUNCTION[mode](mock_session, cli_arg)
+    assert got is None or got[-1][0] == 'Результаты неполные', (
+        'При истечении времени режим должен вернуть неполные результаты'
+    )
+
+
+def test_archive_skips_damaged_files(monkeypatch, tmp_path, caplog):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    downloads_dir = tmp_path / 'downloads'
+    downloads_dir.mkdir()
+    (downloads_dir / 'python-docs-epub.zip').write_bytes(b'')
+    (downloads_dir / 'python-docs-text.zip').write_bytes(b'PK\x03\x04')
+    with zipfile.ZipFile(downloads_dir / 'python-docs-html.zip', 'w') as zf:
+        zf.writestr('python-docs-html/index.html', '<h1>Python</h1>')
+    got = main.archive(None)
+    assert [row[:2] for row in got[1:]] == [
+        ('python-docs-html.zip', 'python-docs-html/index.html')
+    ], 'Повреждённые архивы должны пропускаться'
+    assert caplog.text.count('не является zip-архивом') == 2
+
+
 def test_mode_to_function():
     got = main.MODE_TO_FUNCTION
     assert isinstance(got, dict), (
@@ -123,7 +251,10 @@ def test_mode_to_function():
             f'{name_func} - это строка.'
         )
         assert (
-            name_func in ['whats-new', 'latest-versions', 'download', 'pep']
+            name_func in [
+                'whats-new', 'latest-versions', 'download', 'pep', 'archive',
+                'search', 'query', 'prefetch', 'history'
+            ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет ключа `{name_func}`'
@@ -134,7 +265,8 @@ def test_mode_to_function():
         )
         assert (
             func.__name__ in [
-                'whats_new', 'latest_versions', 'download', 'pep'
+                'whats_new', 'latest_versions', 'download', 'pep', 'archive',
+                'search', 'query', 'prefetch', 'history'
             ]
         ), (
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
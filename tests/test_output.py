@@ -90,3 +90,40 @@ def test_output_file():
     assert hasattr(outputs, 'file_output'), (
         'Напишите функцию `file_output` в модуле `output.py`'
     )
+
+
+def test_pretty_output_layout(capsys):
+    outputs.pretty_output([
+        ('Статус', 'Количество'), ('Active', 3), ('日本', None)
+    ])
+    captured_out, _ = capsys.readouterr()
+    assert captured_out == (
+        '+--------+------------+\n'
+        '| Статус | Количество |\n'
+        '+--------+------------+\n'
+        '| Active | 3          |\n'
+        '| 日本   | None       |\n'
+        '+--------+------------+\n'
+    ), 'Таблица должна совпадать с форматом PrettyTable'
+
+
+def test_pretty_output_stream(monkeypatch, capsys):
+    monkeypatch.setattr(outputs, 'TABLE_SAMPLE_SIZE', 1)
+    outputs.pretty_output(
+        row for row in [('Версия',), ('3.9',), ('3.10.12',)]
+    )
+    captured_out, _ = capsys.readouterr()
+    assert '| 3.10.… |' in captured_out, (
+        'Значения шире выборки должны обрезаться'
+    )
+
+
+def test_pretty_output_pages(capsys):
+    outputs.pretty_output(
+        [('PEP',), *((number,) for number in range(5))],
+        Namespace(page_size=2)
+    )
+    captured_out, _ = capsys.readouterr()
+    assert captured_out.count('| PEP |') == 3, (
+        'Заголовок должен повторяться на каждой странице'
+    )
@@ -0,0 +1,145 @@
+from contextlib import closing
+import pytest
+
+from bs4 import BeautifulSoup
+try:
+    from src import peps
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `peps.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `peps.py`'
+
+PEP_PAGE = '''
+<h1 class="page-title">PEP 695 – Type Parameter Syntax</h1>
+<dl class="rfc2822 field-list simple">
+<dt class="field-odd">Author<span class="colon">:</span></dt>
+<dd class="field-odd">Eric Traut</dd>
+<dt class="field-even">Status<span class="colon">:</span></dt>
+<dd class="field-even"><abbr>Final</abbr></dd>
+<dt class="field-odd">Type<span class="colon">:</span></dt>
+<dd class="field-odd"><abbr>Standards Track</abbr></dd>
+<dt class="field-even">Created<span class="colon">:</span></dt>
+<dd class="field-even">15-Jun-2022</dd>
+<dt class="field-odd">Python-Version<span class="colon">:</span></dt>
+<dd class="field-odd">3.12</dd>
+<dt class="field-even">Post-History<span class="colon">:</span></dt>
+<dd class="field-even">20-Jun-2022,
+  04-Dec-2022</dd>
+</dl>
+'''
+
+PEP_INDEX = '''
+<section id="pep-content">
+<table><tbody>
+<tr><td><abbr title="Process, Active">PA</abbr></td>
+<td><a href="pep-0001/">1</a></td>
+<td><a href="pep-0001/">PEP Purpose and Guidelines</a></td></tr>
+<tr><td><abbr title="Standards Track, Final">SF</abbr></td>
+<td><a href="pep-0695/">695</a></td>
+<td><a href="pep-0695/">Type Parameter Syntax</a></td></tr>
+</tbody></table>
+<table><tbody>
+<tr><td><abbr title="Standards Track, Final">SF</abbr></td>
+<td><a href="pep-0695/">695</a></td>
+<td><a href="pep-0695/">Type Parameter Syntax</a></td></tr>
+<tr><td><abbr title="Informational">I</abbr></td>
+<td><a href="pep-3000/">3000</a></td>
+<td><a href="pep-3000/">Python 3000</a></td></tr>
+</tbody></table>
+</section>
+'''
+
+
+def test_parse_pep_index():
+    got = peps.parse_pep_index(
+        BeautifulSoup(PEP_INDEX, 'lxml'), 'https://peps.python.org/'
+    )
+    assert got == {
+        1: ('https://peps.python.org/pep-0001/', {'Active', 'Accepted'}),
+        695: ('https://peps.python.org/pep-0695/', {'Final'}),
+        3000: ('https://peps.python.org/pep-3000/', {'Draft', 'Active'}),
+    }, 'Каждый PEP должен попадать в индекс один раз с ожидаемыми статусами'
+
+
+def test_parse_pep_page():
+    got = peps.parse_pep_page(
+        BeautifulSoup(PEP_PAGE, 'lxml'), 'https://peps.python.org/pep-0695/'
+    )
+    assert (got.number, got.status, got.type, got.python_version) == (
+        695, 'Final', 'Standards Track', '3.12'
+    ), 'Из заголовка PEP должны извлекаться все поля'
+    assert got.title == 'PEP 695 – Type Parameter Syntax'
+    assert got.post_history == '20-Jun-2022, 04-Dec-2022'
+    assert got.replaces is None
+    assert not hasattr(got, '__dict__'), (
+        'Записи PEP должны использовать `__slots__`'
+    )
+
+
+def test_parse_pep_page_unpaired_fields():
+    page = '''
+    <dl class="rfc2822">
+    <dt>Author:</dt><dd>Guido van Rossum</dd><dd>Barry Warsaw</dd>
+    <dt>Status:</dt><dd>Final</dd>
+    <dt>Sponsor:</dt>
+    <dt>Type:</dt><dd>Process</dd>
+    </dl>
+    '''
+    got = peps.parse_pep_page(
+        BeautifulSoup(page, 'lxml'), 'https://peps.python.org/pep-0008/'
+    )
+    assert (got.author, got.sponsor, got.status, got.type) == (
+        'Guido van Rossum', None, 'Final', 'Process'
+    ), 'Лишний или отсутствующий dd не должен сдвигать остальные поля'
+
+
+def test_query_pep_records(tmp_path):
+    records = [
+        peps.PepRecord(
+            number=number, status=status,
+            type='Standards Track', python_version=version
+        )
+        for number, status, version in (
+            (1, 'Accepted', '3.13'),
+            (2, 'Accepted', '3.12'),
+            (3, 'Draft', '3.13'),
+            (4, 'Accepted', '3.12, 3.13'),
+        )
+    ]
+    with closing(peps.connect_pep_store(tmp_path / 'peps.sqlite3')) as conn:
+        peps.save_pep_records(conn, records)
+        peps.save_pep_records(conn, records[:1])
+        got = peps.query_pep_records(
+            conn, status='Accepted', type='Standards Track',
+            python_version='3.13'
+        )
+        assert [record.number for record in got] == [1, 4], (
+            'Запрос должен учитывать все переданные фильтры и все версии PEP'
+        )
+        assert len(peps.query_pep_records(conn)) == 4
+
+
+def test_json_object_stream():
+    text = '{"8": {"number": 8, "status": "Active"}, "12": 1234, "x": "日本"}'
+    for size in (1, 3, len(text)):
+        got = dict(peps.JsonObjectStream(
+            text[start:start + size] for start in range(0, len(text), size)
+        ))
+        assert got == {
+            '8': {'number': 8, 'status': 'Active'}, '12': 1234, 'x': '日本'
+        }, f'Объект должен разбираться при блоках по {size} символов'
+    with pytest.raises(ValueError):
+        dict(peps.JsonObjectStream(['{"8": {"number": 8}']))
+
+
+def test_parse_pep_json():
+    got = peps.parse_pep_json('695', {
+        'number': 695, 'title': 'Type Parameter Syntax',
+        'authors': 'Eric Traut', 'status': 'Final', 'python_version': '3.12',
+        'delegate': None, 'url': 'https://peps.python.org/pep-0695/',
+    })
+    assert (got.number, got.status, got.author, got.python_version) == (
+        695, 'Final', 'Eric Traut', '3.12'
+    ), 'Поля JSON-индекса должны совпадать с полями заголовка PEP'
+    assert got.title == 'PEP 695 – Type Parameter Syntax'
+    assert got.pep_delegate is None
@@ -0,0 +1,76 @@
+import zipfile
+from contextlib import closing
+
+import pytest
+try:
+    from src import search
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `search.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `search.py`'
+
+DOCUMENTS = {
+    'docs/library/re.html': (
+        '<h1>re &mdash; Regular expression operations</h1>'
+        '<script>var regular = 1;</script>'
+        '<p>Regular expression syntax. Regular patterns.</p>'
+    ),
+    'docs/library/glob.txt': 'Unix style pathname pattern expansion',
+    'docs/_static/basic.css': 'regular { }',
+}
+
+
+def write_archive(path, documents):
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name, text in documents.items():
+            archive.writestr(name, text)
+
+
+@pytest.fixture
+def connection(tmp_path):
+    with closing(search.connect_index(tmp_path / 'search.sqlite3')) as conn:
+        yield conn
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = tmp_path / 'python-docs-html.zip'
+    write_archive(path, DOCUMENTS)
+    return path
+
+
+def test_positions_roundtrip():
+    positions = [0, 1, 127, 128, 300, 70000]
+    got = search.decode_positions(search.encode_positions(positions))
+    assert got == positions, 'Позиции должны восстанавливаться без потерь'
+
+
+def test_search_terms_and_phrases(connection, archive_path):
+    assert search.update_index(connection, archive_path) == (2, 0), (
+        'Индексироваться должны только текстовые документы'
+    )
+    assert search.search_index(connection, 'regular') == [
+        ('python-docs-html.zip/docs/library/re.html', 3)
+    ], 'Разметка и скрипты не должны попадать в индекс'
+    assert search.search_index(connection, 'pattern') == [
+        ('python-docs-html.zip/docs/library/glob.txt', 1)
+    ]
+    assert search.search_index(connection, '"expression syntax"') == [
+        ('python-docs-html.zip/docs/library/re.html', 1)
+    ], 'Фраза в кавычках должна искаться целиком'
+    assert search.search_index(connection, '"syntax expression"') == []
+
+
+def test_incremental_update(connection, archive_path):
+    search.update_index(connection, archive_path)
+    documents = dict(DOCUMENTS)
+    documents['docs/library/glob.txt'] = 'Filename pattern matching'
+    del documents['docs/library/re.html']
+    write_archive(archive_path, documents)
+    assert search.update_index(connection, archive_path) == (1, 1), (
+        'Переиндексироваться должны только изменённые документы'
+    )
+    assert search.search_index(connection, 'regular') == []
+    assert search.search_index(connection, 'matching') == [
+        ('python-docs-html.zip/docs/library/glob.txt', 1)
+    ]
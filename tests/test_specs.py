@@ -0,0 +1,58 @@
+import pytest
+from bs4 import BeautifulSoup
+try:
+    from src import specs
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `specs.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `specs.py`'
+
+SIDEBAR = '''
+<div class="sphinxsidebarwrapper">
+<ul><li><a href="https://docs.python.org/3/">Navigation</a></li></ul>
+<ul>
+<li><a href="https://docs.python.org/3.14/">Python 3.14 (in development)</a>
+</li>
+<li><a href="https://docs.python.org/3.13/">Python 3.13 (stable)</a></li>
+<li><a href="https://www.python.org/doc/versions/">All versions</a></li>
+</ul>
+</div>
+'''
+WHATS_NEW = '''
+<section id="what-s-new-in-python">
+<div class="toctree-wrapper compound">
+<h2>Python 3.13</h2><a href="3.13.html">What's New In Python 3.13</a>
+</div>
+<div class="toctree-wrapper compound"><a href="changelog.html">Log</a></div>
+</section>
+'''
+
+
+def test_selector_find_raises():
+    soup = BeautifulSoup(WHATS_NEW, 'lxml')
+    with pytest.raises(BaseException) as excinfo:
+        specs.Selector('table.docutils').find(soup)
+    assert excinfo.typename == 'ParserFindTagException', (
+        'Отсутствие обязательного тега должно вызывать '
+        '`ParserFindTagException`'
+    )
+    assert 'table.docutils' in str(excinfo.value)
+
+
+def test_latest_versions_spec():
+    got = specs.LATEST_VERSIONS.extract(BeautifulSoup(SIDEBAR, 'lxml'))
+    assert [row['version'] for row in got] == [
+        'Python 3.14 (in development)', 'Python 3.13 (stable)', 'All versions'
+    ], 'Должны извлекаться только ссылки из списка всех версий'
+    assert got[0]['href'] == 'https://docs.python.org/3.14/'
+
+
+def test_whats_new_index_spec():
+    got = specs.WHATS_NEW_INDEX.extract(BeautifulSoup(WHATS_NEW, 'lxml'))
+    assert got == [
+        {'version': 'Python 3.13', 'href': '3.13.html'},
+        {'version': None, 'href': 'changelog.html'},
+    ], 'Необязательные поля без совпадений должны быть равны `None`'
+    with pytest.raises(BaseException) as excinfo:
+        specs.WHATS_NEW_INDEX.extract(BeautifulSoup(SIDEBAR, 'lxml'))
+    assert excinfo.typename == 'ParserFindTagException'
@@ -0,0 +1,61 @@
+from argparse import Namespace
+
+import pytest
+from requests_cache import CachedSession
+
+from synthetic_server import SyntheticSite
+try:
+    from src import main
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `main.py`'
+
+
+@pytest.fixture
+def site(monkeypatch, tmp_path):
+    with SyntheticSite(pep_count=60, version_count=5) as site:
+        monkeypatch.setattr(main, 'PEP_INDEX_URL', site.pep_index_url)
+        monkeypatch.setattr(main, 'MAIN_DOC_URL', site.main_doc_url)
+        monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+        yield site
+
+
+def test_pep_on_synthetic_site(site):
+    got = main.pep(CachedSession(backend='memory'))
+    assert got[-1] == ('Total', 60), (
+        'Функция `pep` должна обработать каждый PEP из индекса один раз'
+    )
+    assert dict(got[1:-1])['Final'] == 7
+
+
+def test_pep_json_backend(site, caplog):
+    html = main.pep(CachedSession(backend='memory'))
+    caplog.clear()
+    got = main.pep(
+        CachedSession(backend='memory'), Namespace(backend='json', sample=60)
+    )
+    assert got == html, (
+        'JSON-индекс должен давать ту же таблицу статусов, что и страницы PEP'
+    )
+    assert 'Несовпадающие статусы' not in caplog.text, (
+        'Статусы JSON-индекса совпадают со страницами PEP'
+    )
+
+
+def test_whats_new_on_synthetic_site(site):
+    got = main.whats_new(CachedSession(backend='memory'))
+    assert len(got) == 6
+    assert got[1] == (
+        site.main_doc_url + 'whatsnew/3.0.html', 'Python 3.0', 'Editor 3.0'
+    )
+
+
+def test_pep_with_errors(monkeypatch, tmp_path):
+    with SyntheticSite(pep_count=40, error_rate=0.5, seed=1) as site:
+        monkeypatch.setattr(main, 'PEP_INDEX_URL', site.pep_index_url)
+        monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+        got = main.pep(CachedSession(backend='memory'))
+    assert 0 < got[-1][1] < 40, (
+        'Страницы с ошибками не должны учитываться в итоговой таблице'
+    )
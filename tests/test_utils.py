@@ -1,3 +1,5 @@
+import threading
+import time
 import pytest
 import requests
 import requests_mock
@@ -54,3 +56,39 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def test_page_soup_releases_tree(mock_session):
+    mock_session.page_slots = threading.BoundedSemaphore(1)
+    with utils.page_soup(mock_session, 'mock://docs.python.org/') as got:
+        assert not mock_session.page_slots.acquire(blocking=False), (
+            'Страница в обработке должна занимать слот'
+        )
+        assert 'breathtaken' in got.text
+    assert got.decomposed, (
+        'В режиме ограниченной памяти дерево страницы должно освобождаться'
+    )
+    assert mock_session.page_slots.acquire(blocking=False), (
+        'После обработки страницы слот должен освобождаться'
+    )
+
+
+def test_get_response_deadline(mock_session):
+    mock_session.deadline = time.monotonic() - 1
+    with pytest.raises(BaseException) as excinfo:
+        utils.get_response(mock_session, 'mock://docs.python.org/')
+    assert excinfo.typename == 'DeadlineExceededException', (
+        'После истечения времени работы запросы не должны отправляться'
+    )
+
+
+def test_get_soup_parses_bytes(mock_session):
+    url = 'mock://peps.python.org/pep-0001/'
+    mock_session.mock_adapter.register_uri(
+        'GET', url, content='<p>Статус: Активен</p>'.encode('utf-8'),
+        headers={'Content-Type': 'text/html'}
+    )
+    got = utils.get_soup(mock_session, url)
+    assert got.p.text == 'Статус: Активен', (
+        'Функция `get_soup` должна разбирать тело ответа в кодировке utf-8'
+    )
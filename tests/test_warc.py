@@ -0,0 +1,72 @@
+import pytest
+import requests_mock
+from requests_cache import CachedSession
+try:
+    from src import downloads, utils, warc
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `warc.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `warc.py`'
+
+PAGE_URL = 'https://peps.python.org/pep-0008/'
+PAGE_TEXT = '<dt>Status</dt><dd>Активен</dd>'
+ARCHIVE_URL = 'https://docs.python.org/3/archives/python-docs-html.zip'
+ARCHIVE_CONTENT = bytes(range(250)) * 4
+
+
+def test_record_and_replay(tmp_path):
+    warc_path = tmp_path / 'crawl.warc'
+    session = warc.record_session(CachedSession(backend='memory'), warc_path)
+    with requests_mock.Mocker() as mock:
+        mock.get(
+            PAGE_URL, text=PAGE_TEXT,
+            headers={'Content-Type': 'text/html; charset=utf-8'}
+        )
+        mock.head(PAGE_URL, text='')
+        utils.get_response(session, PAGE_URL)
+        session.head(PAGE_URL)
+    assert warc_path.read_bytes().startswith(b'WARC/1.0\r\n'), (
+        'Ответы должны записываться в формате WARC'
+    )
+    assert list(warc.index_records(warc_path)) == [PAGE_URL], (
+        'В архив должны попадать только ответы на GET-запросы'
+    )
+    assert warc_path.read_bytes().count(b'WARC-Type: response') == 1, (
+        'Каждый ответ должен записываться в архив один раз'
+    )
+
+    replayed = warc.replay_session(
+        CachedSession(backend='memory'), warc_path
+    )
+    got = utils.get_response(replayed, PAGE_URL)
+    assert (got.status_code, got.text) == (200, PAGE_TEXT), (
+        'При воспроизведении ответ должен совпадать с записанным'
+    )
+    assert got.headers['Content-Type'] == 'text/html; charset=utf-8'
+    with pytest.raises(ConnectionError):
+        utils.get_response(replayed, PAGE_URL + 'missing/')
+
+
+def test_record_and_replay_download(monkeypatch, tmp_path):
+    monkeypatch.setattr(downloads, 'SEGMENT_THRESHOLD', 1)
+    warc_path = tmp_path / 'crawl.warc'
+    session = warc.record_session(CachedSession(backend='memory'), warc_path)
+    with requests_mock.Mocker() as mock:
+        mock.head(ARCHIVE_URL, headers={
+            'Accept-Ranges': 'bytes', 'Content-Length': '1000'
+        })
+        mock.get(ARCHIVE_URL, content=ARCHIVE_CONTENT)
+        downloads.download_file(session, ARCHIVE_URL, tmp_path)
+    assert [request.method for request in mock.request_history] == [
+        'GET'
+    ], 'При записи архив должен загружаться одним GET-запросом'
+
+    replayed = warc.replay_session(
+        CachedSession(backend='memory'), warc_path
+    )
+    replay_dir = tmp_path / 'replay'
+    replay_dir.mkdir()
+    path = downloads.download_file(replayed, ARCHIVE_URL, replay_dir)
+    assert path.read_bytes() == ARCHIVE_CONTENT, (
+        'Архив должен воспроизводиться из WARC-файла'
+    )